@@ -0,0 +1,55 @@
+from collections import deque
+from typing import Iterable, Iterator
+
+
+# Multi-pattern string matcher (Aho-Corasick automaton).
+# Compiled once from a set of patterns, it reports every occurrence of every pattern
+# in a text in a single left-to-right pass, independent of how many patterns there are.
+class AhoCorasick:
+    def __init__(self, patterns: Iterable[str]):
+        # Trie of the patterns: per node its transitions, failure link and the patterns ending there
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if pattern not in self._out[node]:
+            self._out[node].append(pattern)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                # A node also matches every pattern matched by its failure target
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    # Yields (start, end, pattern) for every occurrence, ordered by end position
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str]]:
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for pattern in self._out[node]:
+                yield i + 1 - len(pattern), i + 1, pattern
@@ -1,128 +1,210 @@
 from multiprocessing.connection import answer_challenge
-import re
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
-from flask import Flask, request, jsonify
+import json
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 
-from chat.conversation_history import ConversationNode
-from process_recipe.extract_ingredients import extract_ingredients
-from process_recipe.extract_steps import extract_steps
-from process_recipe.step_components.extract_methods import extract_methods
+from process_recipe.ingest import load_recipe_data, validate_recipe_url, RecipeFetchError
+from process_recipe.recipe_cache import recipe_cache_from_env
 from process_recipe.recipe import Recipe
-from chat.handle_question import handle_question, reset_conversation_state
+from process_recipe.step_components.lexicons import get_lexicons
+from chat.handle_question import handle_question
+from chat.session_store import Session, session_store_from_env
+from bulk_ingest import (
+    iter_bulk_ingest,
+    worker_count,
+    max_fetch_workers,
+    max_process_workers,
+    DEFAULT_FETCH_WORKERS,
+)
+from jobs import job_manager_from_env
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["X-Session-ID"])
+
+recipe_cache = recipe_cache_from_env()
+session_store = session_store_from_env()
+job_manager = job_manager_from_env(recipe_cache)
+
+SESSION_COOKIE = "session_id"
+SESSION_HEADER = "X-Session-ID"
+
+
+# Resolves the caller's session from the X-Session-ID header or the session cookie,
+# starting a new one if there is none (or it has expired)
+def current_session() -> Session:
+    if "session" not in g:
+        session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+        session = session_store.get(session_id) if session_id else None
+        g.session = session or Session()
+    return g.session
+
+
+# Persists the session used by the request and hands its ID back to the client
+@app.after_request
+def save_session(response):
+    session = g.pop("session", None)
+    if session is not None:
+        session_store.save(session)
+        response.headers[SESSION_HEADER] = session.session_id
+        response.set_cookie(SESSION_COOKIE, session.session_id, httponly=True, samesite="Lax")
+    return response
 
-recipe = None
-allowed_domains = [
-    "foodnetwork.com",
-    "seriouseats.com",
-    "allrecipes.com",
-]
 
 @app.get("/")
 def home():
     return "OK", 200
 
+# Makes the extracted recipe the session's recipe and builds the /get-recipe response
+def _load_recipe_into_session(session: Session, url: str, recipe_data: dict, timings: dict) -> dict:
+    recipe = Recipe(
+        recipe_data["name"],
+        url,
+        recipe_data["ingredients"], 
+        recipe_data["steps"],
+        recipe_data.get("timeline")
+    )
+
+    # Loading a new recipe starts a fresh conversation
+    session.reset()
+    session.recipe = recipe
+
+    return {
+        "status": "saved",
+        "session_id": session.session_id,
+        "recipe_url": recipe.get_url(),
+        "recipe_name": recipe.get_name(),
+        "num_steps": len(recipe.get_steps()),
+        # Seconds spent in each ingest stage (stages missing here were served from the recipe cache)
+        "timings": timings
+    }
+
+
 @app.post("/get-recipe")
 def get_recipe():
-    global recipe
+    session = current_session()
 
     data = request.get_json(silent=True) or {}
     url = data.get("url")
 
-    if not url or not isinstance(url, str):
-        return jsonify({"error": "Missing or invalid 'url' field"}), 400
-
-    # Basic URL format validation
-    url_pattern = re.compile(r"^(https?://)[^\s/$.?#].[^\s]*$", re.IGNORECASE)
-    if not url_pattern.match(url):
-        return jsonify({"error": "Invalid URL format"}), 400
+    error = validate_recipe_url(url)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # Async mode: fetch and extract on a background worker, the client polls /jobs/<id>
+    if data.get("async"):
+        job = job_manager.submit(url)
+        response = job.to_dict()
+        response["status_url"] = f"/jobs/{job.job_id}"
+        response["result_url"] = f"/jobs/{job.job_id}/result"
+        return jsonify(response), 202
+
+    # Fetch the page (or reuse the cached copy) and extract the recipe
+    #  (JSON-LD fast path when the page has it, HTML parsing otherwise)
+    timings = {}
+    try:
+        recipe_data = load_recipe_data(url, recipe_cache, timings)
+    except RecipeFetchError as e:
+        error = {"error": e.message}
+        if e.detail:
+            error["detail"] = e.detail
+        return jsonify(error), 502
+
+    return jsonify(_load_recipe_into_session(session, url, recipe_data, timings)), 200
+
+
+# Status of an async ingest job: queued, running, done or error
+@app.get("/jobs/<job_id>")
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+# Loads a finished job's recipe into the caller's session, like a synchronous /get-recipe
+@app.get("/jobs/<job_id>/result")
+def get_job_result(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    if not job.finished():
+        return jsonify(job.to_dict()), 202
+    if job.status == "error":
+        return jsonify(job.to_dict()), 502
+
+    session = current_session()
+    return jsonify(_load_recipe_into_session(session, job.url, job.recipe_data, job.timings)), 200
+
+
+# Ingests a list of URLs concurrently and streams one JSON line per URL as it completes
+@app.post("/bulk-ingest")
+def bulk_ingest():
+    data = request.get_json(silent=True) or {}
+    urls = data.get("urls")
 
-    parsed = urlparse(url)
-    hostname = (parsed.hostname or "").lower()
-    if not any(hostname == d or hostname.endswith("." + d) for d in allowed_domains):
-        return jsonify({"error": "URL must be from foodnetwork.com, seriouseats.com, or allrecipes.com"}), 400
+    if not isinstance(urls, list) or not urls or not all(isinstance(u, str) for u in urls):
+        return jsonify({"error": "Missing or invalid 'urls' field"}), 400
 
-    # Fetch the page and parse HTML with BeautifulSoup
     try:
-        response = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-    except requests.RequestException as e:
-        return jsonify({"error": "Failed to fetch URL", "detail": str(e)}), 502
-
-    if response.status_code < 200 or response.status_code >= 300:
-        return jsonify({"error": f"Upstream returned status {response.status_code}"}), 502
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    recipe_url = url
-    recipe_text = str(soup)
-
-    # Try to get the name of the page (recipe)
-    recipe_name = None
-    if soup.title:
-        recipe_name = soup.title.get_text(strip=True)
-    # Try other selectors if title is absent or looks generic
-    if not recipe_name or recipe_name.lower() in ['untitled', 'recipe', 'foodnetwork.com']:
-        # Try h1 or class/id commonly used for recipe titles
-        h1 = soup.find('h1')
-        if h1 and h1.get_text(strip=True):
-            recipe_name = h1.get_text(strip=True)
-
-    # Process the recipe and extract necessary information
-    ingredients = extract_ingredients(recipe_text)
-    recipe = Recipe(
-        recipe_name,
-        recipe_url,
-        extract_ingredients(recipe_text), 
-        extract_steps(recipe_text, ingredients)
+        fetch_workers = worker_count(
+            data.get("fetch_workers"), "'fetch_workers'", DEFAULT_FETCH_WORKERS, max_fetch_workers()
+        )
+        process_workers = worker_count(
+            data.get("process_workers"), "'process_workers'", max_process_workers(), max_process_workers()
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = iter_bulk_ingest(
+        urls,
+        recipe_cache,
+        max_fetch_workers=fetch_workers,
+        max_process_workers=process_workers,
     )
-
-    return jsonify({
-        "status": "saved",
-        "recipe_url": recipe.get_url(),
-        "recipe_name": recipe.get_name(),
-        "num_steps": len(recipe.get_steps())
-    }), 200
+    lines = (json.dumps(result) + "\n" for result in results)
+    return Response(stream_with_context(lines), mimetype="application/x-ndjson")
 
 
 @app.get("/get-steps")
 def get_steps():
-    global recipe
-    if recipe.get_steps() is None:
+    recipe = current_session().recipe
+    if recipe is None or recipe.get_steps() is None:
         return jsonify({"error": "No steps saved"}), 404
     return jsonify({"steps": recipe.get_steps()}), 200
 
 @app.get("/get-ingredients")
 def get_ingredients():
-    global recipe
-    if recipe.ingredients is None:
+    recipe = current_session().recipe
+    if recipe is None or recipe.ingredients is None:
         return jsonify({"error": "No steps saved"}), 404
     return jsonify({"ingredients": recipe.ingredients}), 200
 
 @app.get("/get-methods")
 def get_methods():
-    global recipe
+    recipe = current_session().recipe
     if not recipe or not recipe.get_steps():
         return jsonify({"error": "No recipe loaded"}), 404
 
+    # Methods were already extracted for each step when the recipe was loaded
     all_methods = []
     for step in recipe.get_steps():
-        all_methods.extend(extract_methods(step["description"]))
+        all_methods.extend(step["methods"])
     return jsonify({"methods": sorted(set(all_methods))}), 200
 
 
 @app.post("/ask-question")
 def ask_question():
-    global recipe
+    session = current_session()
 
     data = request.get_json(silent=True) or {}
     question = data.get("question")
 
+    if not question:
+        return jsonify({"error": "Missing 'question' field"}), 400
+    if session.recipe is None:
+        return jsonify({"error": "No recipe loaded"}), 404
 
-    result = handle_question(question, recipe)
+    result = handle_question(question, session)
     
     # Handle both old string format and new dict format for backward compatibility
     if isinstance(result, str):
@@ -135,23 +217,21 @@ def ask_question():
 
 @app.get("/conversation-history")
 def get_history():
-    return ConversationNode.to_list()
+    return jsonify(current_session().conversation.to_list()), 200
 
 
 
 @app.post("/reset")
 def reset():
-    global recipe
-    
-    # Reset the global recipe to None
-    recipe = None
-    
-    # Reset conversation state in handle_question module
-    reset_conversation_state()
+    # Drop the session's recipe and conversation state
+    current_session().reset()
     
     return jsonify({"status": "reset"}), 200
 
 
 if __name__ == "__main__":
+    # Load (or build and save) the tool and method lexicons before serving, rather than in
+    # the first request that extracts a recipe
+    get_lexicons()
     app.run(host="0.0.0.0", port=8080, debug=True)
 
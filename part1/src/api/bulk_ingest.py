@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Iterator, Optional
+
+from dotenv import load_dotenv
+
+from process_recipe.ingest import (
+    validate_recipe_url,
+    fetch_recipe_html,
+    extract_recipe_data,
+    recipe_data_key,
+    RecipeFetchError,
+)
+from process_recipe.recipe_cache import RecipeCache, recipe_cache_from_env
+
+DEFAULT_FETCH_WORKERS = 8
+
+
+# Upper bounds on the pools a bulk ingest may ask for (.env):
+#   BULK_MAX_FETCH_WORKERS: concurrent downloads, default 32
+#   BULK_MAX_PROCESS_WORKERS: extraction processes, default the number of cores
+def max_fetch_workers() -> int:
+    return int(os.getenv("BULK_MAX_FETCH_WORKERS", 32))
+
+
+def max_process_workers() -> int:
+    return int(os.getenv("BULK_MAX_PROCESS_WORKERS", os.cpu_count() or 1))
+
+
+# A pool size asked for by the caller: a positive integer, capped at `maximum`.
+# None means `default`, capped the same way.
+def worker_count(value, name: str, default: int, maximum: int) -> int:
+    if value is None:
+        return min(default, maximum)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return min(value, maximum)
+
+
+def _result(url: str, recipe_data: dict) -> dict:
+    return {
+        "url": url,
+        "status": "saved",
+        "recipe_name": recipe_data["name"],
+        "num_steps": len(recipe_data["steps"]),
+        "source": recipe_data.get("source"),
+    }
+
+
+def _error(url: str, message: str, detail: Optional[str] = None) -> dict:
+    result = {"url": url, "status": "error", "error": message}
+    if detail:
+        result["detail"] = detail
+    return result
+
+
+# Ingests many recipe URLs at once and yields one result per URL as soon as it is done.
+# Pages are downloaded concurrently on a bounded thread pool, and extraction (NLTK
+# tagging is CPU-bound and holds the GIL) runs on a process pool so it uses every core.
+def iter_bulk_ingest(urls: Iterable[str], cache: Optional[RecipeCache] = None,
+                     max_fetch_workers: int = 8, max_process_workers: Optional[int] = None) -> Iterator[dict]:
+    with ThreadPoolExecutor(max_workers=max_fetch_workers) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=max_process_workers) as process_pool:
+        # future -> (kind, url, cache entry)
+        pending = {}
+        for url in dict.fromkeys(urls):  # Drop duplicate URLs, keep order
+            error = validate_recipe_url(url)
+            if error:
+                yield _error(url, error)
+                continue
+            pending[fetch_pool.submit(fetch_recipe_html, url, cache)] = ("fetch", url, None)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, url, entry = pending.pop(future)
+
+                if kind == "fetch":
+                    try:
+                        entry = future.result()
+                    except RecipeFetchError as e:
+                        yield _error(url, e.message, e.detail)
+                        continue
+                    except Exception as e:
+                        yield _error(url, "Failed to fetch URL", str(e))
+                        continue
+
+                    recipe_data = cache.get_recipe_data(recipe_data_key(entry)) if cache else None
+                    if recipe_data is not None:
+                        yield _result(url, recipe_data)
+                    else:
+                        pending[process_pool.submit(extract_recipe_data, entry["html"], True, cache)] = ("extract", url, entry)
+
+                else:
+                    try:
+                        recipe_data = future.result()
+                    except Exception as e:
+                        yield _error(url, "Failed to extract recipe", str(e))
+                        continue
+
+                    if cache:
+                        cache.put_recipe_data(recipe_data_key(entry), recipe_data)
+                    yield _result(url, recipe_data)
+
+
+# Command line entry point, e.g. for the nightly pre-warm:
+#   python bulk_ingest.py urls.txt
+#   cat urls.txt | python bulk_ingest.py -
+# Prints one JSON result per line as each URL completes.
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fetch and extract many recipe URLs into the recipe cache.")
+    parser.add_argument("files", nargs="*", help="Files with one URL per line ('-' for stdin)")
+    parser.add_argument("--url", action="append", default=[], help="URL to ingest (can be repeated)")
+    parser.add_argument("--fetch-workers", type=int, default=None,
+                        help=f"Concurrent downloads (default: {DEFAULT_FETCH_WORKERS}, at most BULK_MAX_FETCH_WORKERS)")
+    parser.add_argument("--process-workers", type=int, default=None,
+                        help="Extraction processes (default: all cores, at most BULK_MAX_PROCESS_WORKERS)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+
+    try:
+        fetch_workers = worker_count(args.fetch_workers, "--fetch-workers", DEFAULT_FETCH_WORKERS, max_fetch_workers())
+        process_workers = worker_count(args.process_workers, "--process-workers", max_process_workers(), max_process_workers())
+    except ValueError as e:
+        parser.error(str(e))
+
+    urls = list(args.url)
+    for name in args.files:
+        f = sys.stdin if name == "-" else open(name, "r", encoding="utf-8")
+        with f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+
+    failed = 0
+    for result in iter_bulk_ingest(urls, recipe_cache_from_env(), fetch_workers, process_workers):
+        if result["status"] != "saved":
+            failed += 1
+        print(json.dumps(result), flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+from typing import Callable, Hashable, Optional
+
+
+# Memoizes answers that only depend on the recipe, e.g. the ingredient list or the
+# full recipe, and, for step questions, on the step they are about. Answers are
+# keyed by (intent, step number); step_number is None for whole-recipe intents.
+# The cache belongs to one recipe: asking it about another recipe clears it.
+class AnswerCache:
+    def __init__(self):
+        self._recipe = None
+        self._answers: dict[tuple[str, Optional[Hashable]], str] = {}
+
+    def get(self, recipe, intent: str, step_number: Optional[Hashable], build: Callable[[], str]) -> str:
+        if recipe is not self._recipe:
+            self._recipe = recipe
+            self._answers = {}
+
+        key = (intent, step_number)
+        answer = self._answers.get(key)
+        if answer is None:
+            answer = build()
+            self._answers[key] = answer
+        return answer
+
+    def clear(self):
+        self._recipe = None
+        self._answers = {}
@@ -1,4 +1,4 @@
-import requests
+import http_client
 from chat.preprocess_question import extract_clarification_subject
 from process_recipe.recipe import Recipe
 
@@ -17,7 +17,7 @@ def return_specific_clarification_response(recipe: Recipe, question: str) -> str
     # Get definiton from https://dictionaryapi.dev/
     if clarification_subject:
 
-        response = requests.get(f"https://api.dictionaryapi.dev/api/v2/entries/en/{clarification_subject}")
+        response = http_client.get(f"https://api.dictionaryapi.dev/api/v2/entries/en/{clarification_subject}")
         if response.status_code == 200:
             definitions = response.json()[0]["meanings"]
 
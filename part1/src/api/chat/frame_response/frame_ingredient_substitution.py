@@ -1,7 +1,8 @@
 import re
 import os
-import requests
 from dotenv import load_dotenv
+
+import http_client
 from process_recipe.recipe import Recipe
 
 # Load environment variables
@@ -116,7 +117,7 @@ def _get_substitutes_from_spoonacular(ingredient_name: str):
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params)
         if response.status_code == 200:
             return response.json()
         else:
@@ -1,16 +1,17 @@
 from process_recipe.recipe import Recipe
 
+def fmt(sec: int) -> str:
+    m, s = divmod(int(sec), 60)
+    h, m = divmod(m, 60)
+    if h: 
+        return f"{h} hr {m} min" if m else f"{h} hr"
+    if m: 
+        return f"{m} min"
+    return f"{s} sec"
+
 def return_time_response(recipe: Recipe) -> str:
     step = recipe.current_step
     tinfo = getattr(step, "time", None) or {}
-    def fmt(sec: int) -> str:
-        m, s = divmod(int(sec), 60)
-        h, m = divmod(m, 60)
-        if h: 
-            return f"{h} hr {m} min" if m else f"{h} hr"
-        if m: 
-            return f"{m} min"
-        return f"{s} sec"
     answer = "I couldn't find an explicit time for this step."
     if tinfo:
         if tinfo.get("min_seconds") is not None and tinfo.get("max_seconds") is not None:
@@ -23,4 +24,31 @@ def return_time_response(recipe: Recipe) -> str:
         elif tinfo.get("qualitative"):
             answer = " / ".join(tinfo["qualitative"])
     
-    return answer
\ No newline at end of file
+    return answer
+
+
+# Time from the start of the current step to the end of the recipe, from the precomputed timeline
+def return_time_remaining_response(recipe: Recipe) -> str:
+    step = recipe.current_step
+    entries = recipe.timeline["steps"]
+    if step is None or not entries or not recipe.timeline["total_s"]:
+        return "I couldn't find enough time information in this recipe to tell how long is left."
+
+    remaining = entries[step.index]["remaining_s"]
+    if remaining <= 0:
+        return "You're almost done! The remaining steps don't list any times."
+    return f"From the start of step {step.step_number}, about {fmt(remaining)} left until the recipe is done."
+
+
+def return_total_time_response(recipe: Recipe) -> str:
+    timeline = recipe.timeline
+    if not timeline["total_s"]:
+        return "I couldn't find enough time information in this recipe to tell how long it takes."
+
+    answer = f"This recipe takes about {fmt(timeline['total_s'])} in total."
+    if timeline["sequential_s"] > timeline["total_s"]:
+        answer += (
+            " That's with prep done while things bake, chill or simmer;"
+            f" one step at a time it would take {fmt(timeline['sequential_s'])}."
+        )
+    return answer
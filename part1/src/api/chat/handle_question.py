@@ -5,7 +5,7 @@ from chat.preprocess_question import extract_step_number, extract_clarification_
 
 from chat.frame_response.frame_ingredients import return_ingredients_response
 from chat.frame_response.frame_full_recipe import return_full_recipe_response
-from chat.frame_response.frame_time import return_time_response
+from chat.frame_response.frame_time import return_time_response, return_time_remaining_response, return_total_time_response
 from chat.frame_response.frame_clarifications import return_specific_clarification_response
 from chat.frame_response.frame_methods import return_methods_response, return_all_methods_response
 from chat.frame_response.frame_methods import return_methods_response
@@ -15,20 +15,7 @@ from chat.frame_response.frame_ingredient_quantity import get_ingredient_quantit
 
 from process_recipe.recipe import Recipe
 
-from chat.conversation_history import ConversationHistory
-conversation = ConversationHistory()
-
-
-global previous_question
-global previous_answer
-previous_question, previous_answer = None, None
-
-
-def reset_conversation_state():
-    global previous_question
-    global previous_answer
-    previous_question = None
-    previous_answer = None
+from chat.session_store import Session
 
 # helper functions for ingredient-based questions
 _INGREDIENT_STOPWORDS = {
@@ -126,9 +113,80 @@ def _best_match_ingredient_from_question(question: str, recipe):
 
 
 
-def handle_question(question: str, recipe: Recipe) -> dict:
-    global previous_question
-    global previous_answer
+# Answer builders for intents that only depend on the recipe or a single step.
+# handle_question memoizes their output in the session's answer cache.
+
+def _step_number(step):
+    return getattr(step, "step_number", None)
+
+
+def _step_answer(step) -> str:
+    answer = f"<h4 class='chat-header'>Step {step.step_number}:</h4><p>{step.description}</p>"
+    if step.ingredients:
+        answer += f"\n<p>Would you like to know about the ingredients used in this step?</p>"
+    return answer
+
+
+def _step_methods_answer(step) -> str:
+    methods = getattr(step, "methods", [])
+    if methods:
+        methods_str = ", ".join(methods)
+        return f"<p>Methods used in this step: {methods_str}</p>"
+    return "<p>There are no methods for this step.</p>"
+
+
+def _all_methods_answer(recipe) -> str:
+    answer = ""
+    for step in recipe.steps:
+        methods = step.get("methods", [])
+        if methods:
+            methods_str = ", ".join(methods)
+            answer += f"<p>Methods used in step {step['step_number']}: {methods_str}</p>"
+        else:
+            answer += f"<p>There are no methods in step {step['step_number']}.</p>"
+    return answer
+
+
+def _step_tools_answer(step) -> str:
+    if len(step.tools) > 0:
+        tools = ", ".join(step.tools)
+        return f"<p>Tools used in this step: {tools}</p>"
+    return "<p>There are no tools used in this step.</p>"
+
+
+def _all_tools_answer(recipe) -> str:
+    answer = ""
+    for step in recipe.steps:
+        if len(step["tools"]) > 0:
+            tools = ", ".join(step["tools"])
+            answer += f"<p>Tools used in step {step['step_number']}: {tools}</p>"
+        else:
+            answer += f"<p>There are no tools used in step {step['step_number']}.</p>"
+    return answer
+
+
+def _temperature_answer(step) -> str:
+    tinf = getattr(step, "temperature", None) or {}
+    answer = "This step does not specify a temperature."
+    if tinf:
+        parts = []
+        if tinf.get("oven"):
+            parts.append(f"Oven: {tinf['oven']}")
+        if tinf.get("stovetop"):
+            parts.append(f"Stovetop: {tinf['stovetop']}")
+        if parts:
+            answer = "; ".join(parts)
+        elif tinf.get("mentions"):
+            answer = tinf["mentions"][0].get("qualitative") or tinf["mentions"][0].get("text") or answer
+    return answer
+
+
+# Answers a question about the session's recipe. The recipe, the step cursor, the
+# conversation history and the last question/answer all live on the session.
+def handle_question(question: str, session: Session) -> dict:
+    recipe = session.recipe
+    conversation = session.conversation
+    answers = session.answer_cache
 
     conversation.print_history()
 
@@ -137,8 +195,8 @@ def handle_question(question: str, recipe: Recipe) -> dict:
     print("\t", question_type)
 
     if question_type in ["recipe"]:
-        previous_answer = {
-            "answer": return_full_recipe_response(recipe),
+        session.previous_answer = {
+            "answer": answers.get(recipe, "recipe", None, lambda: return_full_recipe_response(recipe)),
             "suggestions": {
                 "What ingredients do I need?": "What ingredients do I need in the whole recipe?",
                 "What tools should I use?": "What tools should I use in the whole recipe?",
@@ -146,8 +204,8 @@ def handle_question(question: str, recipe: Recipe) -> dict:
             }
         }
 
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
 
 
     elif question_type in ["next_step", "previous_step", "current_step", "first_step", "nth_step"]:
@@ -157,7 +215,6 @@ def handle_question(question: str, recipe: Recipe) -> dict:
         if question_type == "first_step":
             # Avoid updating recipe.first_step so that it remains the same 
             subject_step = recipe.first_step
-            answer = f"<h4 class='chat-header'>Step {subject_step.step_number}:</h4><p>{subject_step.description}</p>"
 
         else:
             if question_type == "next_step":
@@ -175,16 +232,15 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                     recipe.current_step = temp_step
                 subject_step = recipe.current_step
 
-            # Construct response
-            answer = f"<h4 class='chat-header'>Step {subject_step.step_number}:</h4><p>{subject_step.description}</p>"
-        
+        # Construct response
+        answer = answers.get(recipe, "step", subject_step.step_number, lambda: _step_answer(subject_step))
+
         # NOTE: If this is true, set previous question, because the bot's response
         #   asks yes/no question at the end
         if subject_step.ingredients:
-            answer += f"\n<p>Would you like to know about the ingredients used in this step?</p>"
-            previous_question = question_type
+            session.previous_question = question_type
         
-        previous_answer = {
+        session.previous_answer = {
             "answer": answer,
             "suggestions": {
                 # visible text, text to put in the input field
@@ -195,8 +251,8 @@ def handle_question(question: str, recipe: Recipe) -> dict:
         }
 
         if stepped:
-            conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-            return previous_answer
+            conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+            return session.previous_answer
         else:
             if question_type == "next_step":
                 return "Congratulations! You've completed the recipe."
@@ -206,14 +262,10 @@ def handle_question(question: str, recipe: Recipe) -> dict:
 
     elif question_type in ["step_methods", "all_methods"]:
         if question_type == "step_methods":
-            methods = getattr(recipe.current_step, "methods", [])
-            if methods:
-                methods_str = ", ".join(methods)
-                answer = f"<p>Methods used in this step: {methods_str}</p>"
-            else:
-                answer = "<p>There are no methods for this step.</p>"
+            step = recipe.current_step
+            answer = answers.get(recipe, question_type, _step_number(step), lambda: _step_methods_answer(step))
 
-            previous_answer = {
+            session.previous_answer = {
                 "answer": answer,
                 "suggestions": {
                     "What ingredients do I need?": "What ingredients do I need in this step?",
@@ -223,16 +275,9 @@ def handle_question(question: str, recipe: Recipe) -> dict:
             }
 
         elif question_type == "all_methods":
-            answer = ""
-            for step in recipe.steps:
-                methods = step.get("methods", [])
-                if methods:
-                    methods_str = ", ".join(methods)
-                    answer += f"<p>Methods used in step {step['step_number']}: {methods_str}</p>"
-                else:
-                    answer += f"<p>There are no methods in step {step['step_number']}.</p>"
-            
-            previous_answer = {
+            answer = answers.get(recipe, question_type, None, lambda: _all_methods_answer(recipe))
+
+            session.previous_answer = {
                 "answer": answer,
                 "suggestions": {
                     "What ingredients are in this recipe?": "What ingredients does this recipe have?",
@@ -240,12 +285,13 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                     "What do I do next?": "What do I do next?",
                 }
             }
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
         
     elif question_type in ["all_ingredients", "step_ingredients"]:
-        answer = return_ingredients_response(recipe, question_type)
-        previous_answer = {
+        step_number = _step_number(recipe.current_step) if question_type == "step_ingredients" else None
+        answer = answers.get(recipe, question_type, step_number, lambda: return_ingredients_response(recipe, question_type))
+        session.previous_answer = {
             "answer": answer,
             "suggestions": {
                 "What methods should I use?": "What methods should I use in this step?",
@@ -253,19 +299,16 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                 "What do I do next?": "What do I do next?",
             }
         }
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
     
 
     elif question_type in ["step_tools", "all_tools"]:
         if question_type == "step_tools":
-            if len(recipe.current_step.tools) > 0:
-                tools = ", ".join(recipe.current_step.tools)
-                answer = f"<p>Tools used in this step: {tools}</p>"
-            else:
-                answer = "<p>There are no tools used in this step.</p>"
-            
-            previous_answer = {
+            step = recipe.current_step
+            answer = answers.get(recipe, question_type, _step_number(step), lambda: _step_tools_answer(step))
+
+            session.previous_answer = {
                 "answer": answer,
                 "suggestions": {
                     "What ingredients do I need?": "What ingredients do I need in this step?",
@@ -274,15 +317,9 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                 }
             }
         elif question_type == "all_tools":
-            answer = ""
-            for step in recipe.steps:
-                if len(step["tools"]) > 0:
-                    tools = ", ".join(step["tools"])
-                    answer += f"<p>Tools used in step {step['step_number']}: {tools}</p>"
-                else:
-                    answer += f"<p>There are no tools used in step {step['step_number']}.</p>"
-        
-            previous_answer = {
+            answer = answers.get(recipe, question_type, None, lambda: _all_tools_answer(recipe))
+
+            session.previous_answer = {
                 "answer": answer,
                 "suggestions": {
                     "What ingredients does this recipe need?": "What ingredients for the whole recipe?",
@@ -290,8 +327,8 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                 }
             }
 
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
 
     elif question_type in ["how_much_ingredient", "vague_quantity"]:
         
@@ -337,12 +374,12 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                         "\nPlease ask again and be more specific."
                     )
             
-            previous_answer = {
+            session.previous_answer = {
                 "answer": f"<p>{answer_text}</p>",
                 "suggestions": None
             }
-            conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-            return previous_answer
+            conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+            return session.previous_answer
 
         elif question_type == "how_much_ingredient":
             ing = _best_match_ingredient_from_question(question, recipe)
@@ -354,26 +391,26 @@ def handle_question(question: str, recipe: Recipe) -> dict:
             if ing and ing.get("name"):
                 suggestions["What can I use instead?"] = f"What can I use instead of {ing['name']}?"
 
-            previous_answer = {
+            session.previous_answer = {
                 "answer": f"<p>{answer_text}</p>",
                 "suggestions": suggestions,
             }
-            conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-            return previous_answer
+            conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+            return session.previous_answer
 
     elif question_type in ["replacement_ingredient"]:
         # Ingredient substitution, e.g. "What can I use instead of butter?"
         answer, ingr = return_ingredient_substitution_response(recipe, question)
 
-        previous_answer = {
+        session.previous_answer = {
             "answer": answer,
             "suggestions": {
                 "How much do I need?": f"How much {ingr} do I need?",
                 "What do I do next?": "What do I do next?",
             },
         }
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
     
     elif question_type in ["vague_item", "vague_method"]:
         # Look at previous step in the conversation
@@ -402,15 +439,15 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                     search_str_google = f"https://www.google.com/search?q={search_term}"
                     search_str_youtube = f"https://www.youtube.com/results?search_query={search_term}"
                     
-                    previous_answer = {
+                    session.previous_answer = {
                         "answer": f"<p>{answer_text}</p>",
                         "suggestions": {
                             "Google": search_str_google,
                             "YouTube": search_str_youtube
                         }
                     }
-                    conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-                    return previous_answer
+                    conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+                    return session.previous_answer
                 else:
                     # Join the methods list with commas
                     methods_list = ", ".join(methods)
@@ -446,15 +483,15 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                     search_str_google = f"https://www.google.com/search?q={search_term}"
                     search_str_youtube = f"https://www.youtube.com/results?search_query={search_term}"
                     
-                    previous_answer = {
+                    session.previous_answer = {
                         "answer": f"<p>{answer_text}</p>",
                         "suggestions": {
                             "Google": search_str_google,
                             "YouTube": search_str_youtube
                         }
                     }
-                    conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-                    return previous_answer
+                    conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+                    return session.previous_answer
                 else:
                     # Join the items list with commas
                     items_list = ", ".join(items)
@@ -463,39 +500,44 @@ def handle_question(question: str, recipe: Recipe) -> dict:
                         "\nPlease ask again and be more specific."
                     )
 
-        previous_answer = {
+        session.previous_answer = {
             "answer": f"<p>{answer_text}</p>",
             "suggestions": None
         }
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
 
     elif question_type in ["time"]:
-        previous_answer = {
-            "answer": return_time_response(recipe),
+        session.previous_answer = {
+            "answer": answers.get(recipe, question_type, _step_number(recipe.current_step), lambda: return_time_response(recipe)),
             "suggestions": None
         }
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
+
+    elif question_type in ["time_remaining", "total_time"]:
+        if question_type == "time_remaining":
+            step_number = _step_number(recipe.current_step)
+            answer = answers.get(recipe, question_type, step_number, lambda: return_time_remaining_response(recipe))
+        else:
+            answer = answers.get(recipe, question_type, None, lambda: return_total_time_response(recipe))
+        session.previous_answer = {
+            "answer": answer,
+            "suggestions": {
+                "How long does this step take?": "How long does this step take?",
+                "What do I do next?": "What do I do next?",
+            }
+        }
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
 
     
     elif question_type in ["temperature"]:
         step = recipe.current_step
-        tinf = getattr(step, "temperature", None) or {}
-        answer = "This step does not specify a temperature."
-        if tinf:
-            parts = []
-            if tinf.get("oven"):
-                parts.append(f"Oven: {tinf['oven']}")
-            if tinf.get("stovetop"):
-                parts.append(f"Stovetop: {tinf['stovetop']}")
-            if parts:
-                answer = "; ".join(parts)
-            elif tinf.get("mentions"):
-                answer = tinf["mentions"][0].get("qualitative") or tinf["mentions"][0].get("text") or answer
-        previous_answer = {"answer": answer, "suggestions": None}
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer 
+        answer = answers.get(recipe, question_type, _step_number(step), lambda: _temperature_answer(step))
+        session.previous_answer = {"answer": answer, "suggestions": None}
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer 
 
 
     
@@ -509,15 +551,15 @@ def handle_question(question: str, recipe: Recipe) -> dict:
         final_definition = return_specific_clarification_response(recipe, question)
         
 
-        previous_answer = {
+        session.previous_answer = {
             "answer": f"<p>{final_definition}</p>",
             "suggestions": {
                 "Google": search_str_google,
                 "YouTube": search_str_youtube
             }
         }
-        conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-        return previous_answer
+        conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+        return session.previous_answer
 
     # Affirmation responses (in response to a yes/no question from the previous bot response)
     #  As of right now, when asking for STEP information, the bot will ask:
@@ -526,45 +568,49 @@ def handle_question(question: str, recipe: Recipe) -> dict:
     elif question_type in ["yes", "no", "repeat", "thanks"]:        
         # If no, await next question from user
         if question_type == "no":
-            previous_answer = {
+            session.previous_answer = {
                 "answer": "Alright. What else would you like to know?",
                 "suggestions": {
                     "What do I do now?": "What do I do now?",
                     "Ingredients this step.": "What ingredients do I need this step?"
                 }
             }
-            conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-            return previous_answer
+            conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+            return session.previous_answer
 
         # If yes, return appropriate response
         #  GIVEN PREVIOUS QUESTION
         elif question_type == "yes":
             #  If previous question is None there is nothing to respond to
-            if previous_question is None:
-                previous_answer = "I'm sorry, I'm not sure what you're responding to."
-                return previous_answer
+            if session.previous_question is None:
+                session.previous_answer = "I'm sorry, I'm not sure what you're responding to."
+                return session.previous_answer
 
             # Return appropriate response based on previous question
-            if previous_question in ["next_step", "previous_step", "current_step"]:
-                resp = return_ingredients_response(recipe, "step_ingredients")
-            elif previous_question in ["first_step"]:
-                resp = return_ingredients_response(recipe, get_first=True)
+            if session.previous_question in ["next_step", "previous_step", "current_step"]:
+                step_number = _step_number(recipe.current_step)
+                resp = answers.get(recipe, "step_ingredients", step_number,
+                                   lambda: return_ingredients_response(recipe, "step_ingredients"))
+            elif session.previous_question in ["first_step"]:
+                step_number = _step_number(recipe.first_step)
+                resp = answers.get(recipe, "step_ingredients", step_number,
+                                   lambda: return_ingredients_response(recipe, get_first=True))
             # elif ...
 
             # Reset previous question
-            previous_question = None
-            previous_answer = {
+            session.previous_question = None
+            session.previous_answer = {
                 "answer": resp,
                 "suggestions": None
             }
-            conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-            return previous_answer
+            conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+            return session.previous_answer
         
         elif question_type == "repeat":
-            if previous_answer is None:
+            if session.previous_answer is None:
                 return "I don't have anything to repeat."
-            conversation.add_step(question, question_type, previous_answer, recipe.current_step)
-            return previous_answer
+            conversation.add_step(question, question_type, session.previous_answer, recipe.current_step)
+            return session.previous_answer
         elif question_type == "thanks":
             return "You're welcome! What other questions do you have?"
 
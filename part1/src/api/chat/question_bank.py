@@ -161,6 +161,22 @@ TIME_QUESTIONS = {
     "how much time will it take to cook": "time",
     "how much time will it take to bake": "time",
     "how much time will it take to prepare": "time",
+
+    # Time left / total time, answered from the recipe timeline:
+    "how long until done": "time_remaining",
+    "how long until it is done": "time_remaining",
+    "how long until its done": "time_remaining",
+    "how long is left": "time_remaining",
+    "how much time is left": "time_remaining",
+    "how much longer": "time_remaining",
+    "time left": "time_remaining",
+    "time remaining": "time_remaining",
+    "total time": "total_time",
+    "what is the total time": "total_time",
+    "what's the total time": "total_time",
+    "how long does the whole recipe take": "total_time",
+    "how long does the recipe take": "total_time",
+    "how long will the whole recipe take": "total_time",
 }
 
 TEMPERATURE_QUESTIONS = {
@@ -0,0 +1,109 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from chat.answer_cache import AnswerCache
+from chat.conversation_history import ConversationHistory
+
+
+# Everything one user's chat needs between requests: the loaded recipe (which also
+# holds the step cursor), the conversation history, the last question/answer and
+# the answers already built for the recipe.
+class Session:
+    def __init__(self, session_id: Optional[str] = None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.recipe = None
+        self.conversation = ConversationHistory()
+        self.previous_question = None
+        self.previous_answer = None
+        self.answer_cache = AnswerCache()
+
+    def reset(self):
+        self.recipe = None
+        self.conversation = ConversationHistory()
+        self.previous_question = None
+        self.previous_answer = None
+        self.answer_cache.clear()
+
+
+# Keeps sessions in process memory, evicting the least recently used past max_sessions.
+# Only suitable for a single worker process.
+class InMemorySessionStore:
+    def __init__(self, max_sessions: int = 1000):
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def save(self, session: Session):
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._sessions.move_to_end(session.session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+# Keeps pickled sessions in a local SQLite file, so several worker processes
+# (e.g. gunicorn workers) on the same machine share them.
+class SqliteSessionStore:
+    def __init__(self, path: str, max_age_seconds: int = 7 * 86400):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(session_id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            return None
+
+    def save(self, session: Session):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?)",
+                (session.session_id, pickle.dumps(session), now),
+            )
+            # Drop sessions nobody has used in a while
+            conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.max_age_seconds,))
+
+    def delete(self, session_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+
+# Picks the session backend from the environment:
+#   SESSION_BACKEND=memory (default) or sqlite, SESSION_DB=<path to the SQLite file>
+def session_store_from_env():
+    backend = os.getenv("SESSION_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        return SqliteSessionStore(os.getenv("SESSION_DB", "sessions.db"))
+    if backend == "memory":
+        return InMemorySessionStore(int(os.getenv("SESSION_MAX", 1000)))
+    raise ValueError(f"Unknown SESSION_BACKEND '{backend}'. Use 'memory' or 'sqlite'.")
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from process_recipe.ingest import load_recipe_data, RecipeFetchError
+from process_recipe.recipe_cache import RecipeCache, normalize_url
+
+
+# One background recipe ingest: queued -> running -> done | error
+class IngestJob:
+    def __init__(self, url: str):
+        self.job_id = uuid.uuid4().hex
+        self.url = url
+        self.status = "queued"
+        self.recipe_data = None
+        self.timings = {}
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+    def to_dict(self) -> dict:
+        job = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "recipe_url": self.url,
+        }
+        if self.status == "done":
+            job["recipe_name"] = self.recipe_data["name"]
+            job["num_steps"] = len(self.recipe_data["steps"])
+        if self.error:
+            job.update(self.error)
+        return job
+
+
+# Runs recipe fetch + extraction on a background thread pool, so /get-recipe can answer
+# right away with a job ID instead of holding the request open through a slow origin.
+# A URL that is already queued or running is coalesced onto its in-flight job.
+# Finished jobs are kept for ttl_seconds so clients can poll for the result.
+# Jobs live in process memory, so this is only suitable for a single worker process.
+class JobManager:
+    def __init__(self, cache: Optional[RecipeCache] = None, max_workers: int = 4, ttl_seconds: int = 600):
+        self.cache = cache
+        self.ttl_seconds = ttl_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._jobs: dict[str, IngestJob] = {}
+        self._in_flight: dict[str, IngestJob] = {}  # normalized URL -> unfinished job
+        self._lock = threading.Lock()
+
+    def submit(self, url: str) -> IngestJob:
+        key = normalize_url(url)
+        with self._lock:
+            self._prune()
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job
+
+            job = IngestJob(url)
+            self._jobs[job.job_id] = job
+            self._in_flight[key] = job
+
+        self._pool.submit(self._run, job, key)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: IngestJob, key: str):
+        job.status = "running"
+        try:
+            job.recipe_data = load_recipe_data(job.url, self.cache, job.timings)
+            job.status = "done"
+        except RecipeFetchError as e:
+            job.error = {"error": e.message}
+            if e.detail:
+                job.error["detail"] = e.detail
+            job.status = "error"
+        except Exception as e:
+            job.error = {"error": "Failed to extract recipe", "detail": str(e)}
+            job.status = "error"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    # Forget finished jobs nobody has collected in time (caller holds the lock)
+    def _prune(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# Job manager configured from the environment (.env):
+#   INGEST_WORKERS=<background ingest threads>, INGEST_JOB_TTL=<seconds a finished job is kept>
+def job_manager_from_env(cache: Optional[RecipeCache] = None) -> JobManager:
+    return JobManager(
+        cache,
+        max_workers=int(os.getenv("INGEST_WORKERS", 4)),
+        ttl_seconds=int(os.getenv("INGEST_JOB_TTL", 600)),
+    )
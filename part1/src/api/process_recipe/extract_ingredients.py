@@ -1,7 +1,9 @@
 from typing import Optional
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 import re as _re
 
+from process_recipe.recipe_document import RecipeDocument, parse_recipe_document
+
 
 # Checks whether contains ingredients text in the tag or a span
 # Only matches if the text is exactly "ingredients" (case-insensitive)
@@ -102,7 +104,8 @@ def _extract_descriptor_and_preparation_from_name(name: Optional[str]) -> tuple[
             prep_indicators = ['cut', 'chopped', 'diced', 'sliced', 'minced', 'grated', 
                              'shredded', 'cubed', 'quartered', 'halved', 'peeled', 
                              'trimmed', 'into', 'in']
-            if any(ind in last_part for ind in prep_indicators):
+            # Whole words only: "in" must not match "skinless"
+            if any(ind in last_part.split() for ind in prep_indicators):
                 preparation = parts[-1]
                 parts = parts[:-1]
                 remaining_name = ', '.join(parts)
@@ -275,9 +278,124 @@ def _parse_li_structured(li: Tag) -> dict:
     }
 
 
+# Units recognized right after the quantity in a plain-text ingredient line
+_UNITS = {
+    'cup', 'cups', 'c',
+    'tablespoon', 'tablespoons', 'tbsp', 'tbsps', 'tbs',
+    'teaspoon', 'teaspoons', 'tsp', 'tsps',
+    'pound', 'pounds', 'lb', 'lbs',
+    'ounce', 'ounces', 'oz',
+    'gram', 'grams', 'g', 'kilogram', 'kilograms', 'kg',
+    'milliliter', 'milliliters', 'ml', 'liter', 'liters', 'l',
+    'quart', 'quarts', 'qt', 'pint', 'pints', 'pt', 'gallon', 'gallons',
+    'pinch', 'pinches', 'dash', 'dashes',
+    'clove', 'cloves', 'can', 'cans', 'package', 'packages', 'packet', 'packets',
+    'jar', 'jars', 'bottle', 'bottles', 'stick', 'sticks', 'slice', 'slices',
+    'bunch', 'bunches', 'sprig', 'sprigs', 'head', 'heads', 'stalk', 'stalks',
+    'piece', 'pieces', 'container', 'containers', 'box', 'boxes', 'bag', 'bags',
+    'envelope', 'envelopes',
+}
+
+# "1", "1 1/2", "1.5", "2-3", "2 to 3"
+_QUANTITY_RE = _re.compile(r'^((?:\d+\s+)?\d+(?:[./]\d+)?(?:\s*(?:-|–|to)\s*\d+(?:[./]\d+)?)?)\s*')
+# "(10 ounce)" as in "1 (10 ounce) package frozen peas"
+_PAREN_RE = _re.compile(r'^(\([^)]*\))\s*')
+# "to taste", "or as needed", ... at the end of a line; not part of the name
+_AMOUNT_NOTE_RE = _re.compile(r',?\s*\b((?:or\s+)?(?:to\s+taste|as\s+needed|as\s+desired))\s*$', _re.I)
+
+# Words that start a preparation note after a comma ("butter, softened", "onion, finely
+# chopped"). Other words ending in -ed count as well, as do adverbs in -ly before them.
+_PREPARATION_WORDS = {
+    'cut', 'torn', 'beaten', 'divided', 'optional', 'plus', 'for', 'at', 'room', 'about',
+    'such', 'if', 'or', 'packed', 'crushed', 'chopped', 'diced', 'sliced', 'minced',
+    'grated', 'shredded', 'cubed', 'julienned', 'quartered', 'halved', 'peeled',
+    'seeded', 'pitted', 'trimmed', 'softened', 'melted', 'drained', 'rinsed', 'thawed',
+}
+
+
+def _starts_preparation(text: str) -> bool:
+    words = text.lower().split()
+    while words and words[0].endswith('ly') and len(words) > 1:
+        words = words[1:]
+    if not words:
+        return False
+    word = words[0].strip('(),;:')
+    return word in _PREPARATION_WORDS or (len(word) > 4 and word.endswith('ed'))
+
+
+# Splits "name, preparation" at the first comma that is followed by a preparation note
+# and preceded by an actual ingredient, so "boneless, skinless chicken breasts" stays whole
+def _split_preparation(text: str) -> tuple[str, str]:
+    start = 0
+    while True:
+        comma = text.find(",", start)
+        if comma < 0:
+            return text, ""
+        before, after = text[:comma].strip(), text[comma + 1:].strip()
+        if _starts_preparation(after) and _extract_descriptor_and_preparation_from_name(before)[0]:
+            return before, after
+        start = comma + 1
+
+
+# Parses a plain-text ingredient line (e.g. "2 cups all-purpose flour, sifted")
+# into the same dict shape produced from the structured HTML spans.
+def parse_ingredient_text(text: str) -> Optional[dict]:
+    # Separate a mixed number from its fraction character ("1½" -> "1 ½") before converting
+    text = _re.sub('(\\d)([\u00BC-\u00BE\u2153-\u215E])', r'\1 \2', text or "")
+    text = _clean_space(_convert_unicode_fractions(text))
+    if not text:
+        return None
+
+    quantity = None
+    match = _QUANTITY_RE.match(text)
+    if match:
+        quantity = match.group(1)
+        text = text[match.end():]
+
+    measurement_parts = []
+    match = _PAREN_RE.match(text)
+    if match:
+        measurement_parts.append(match.group(1))
+        text = text[match.end():]
+
+    words = text.split(" ", 1)
+    if words and words[0].lower().rstrip('.') in _UNITS and len(words) > 1:
+        measurement_parts.append(words[0])
+        text = words[1]
+    measurement = " ".join(measurement_parts) or None
+
+    # "to taste" / "as needed" qualify the amount, not the ingredient
+    amount_note = None
+    match = _AMOUNT_NOTE_RE.search(text)
+    if match:
+        amount_note = match.group(1)
+        text = text[:match.start()]
+
+    # A preparation note after a comma plays the role of the text around the name span
+    text, extra_text = _split_preparation(text)
+    name, descriptor, extracted_preparation = _extract_descriptor_and_preparation_from_name(text.strip())
+    preparation_parts = [p for p in (extracted_preparation, extra_text.strip(), amount_note) if p]
+    preparation = ", ".join(preparation_parts) if preparation_parts else None
+    if name is None:
+        if descriptor is None:
+            return None
+        name, descriptor = descriptor, None
+
+    return {
+        "name": name,
+        "quantity": quantity,
+        "measurement": measurement,
+        "descriptor": descriptor,
+        "preparation": preparation,
+    }
+
 
 def extract_ingredients(recipe: str) -> list[dict]:
-    soup = BeautifulSoup(recipe, "html.parser")
+    return extract_ingredients_from_document(parse_recipe_document(recipe))
+
+
+def extract_ingredients_from_document(document: RecipeDocument) -> list[dict]:
+    soup = document.soup
 
     header: Optional[Tag] = soup.find(
         lambda t: isinstance(t, Tag)  # Is a valid html tag
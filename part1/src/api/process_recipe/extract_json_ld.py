@@ -0,0 +1,111 @@
+from typing import Optional
+import html as _html
+import json
+import re as _re
+
+from process_recipe.extract_ingredients import parse_ingredient_text
+from process_recipe.extract_steps import _split_into_sentences
+
+
+# Matches the JSON-LD script blocks without building a DOM for the page
+_JSON_LD_RE = _re.compile(
+    r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    _re.IGNORECASE | _re.DOTALL,
+)
+_TITLE_RE = _re.compile(r'<title[^>]*>(.*?)</title>', _re.IGNORECASE | _re.DOTALL)
+_TAG_RE = _re.compile(r'<[^>]+>')
+
+
+def _clean_text(text) -> str:
+    if not isinstance(text, str):
+        return ""
+    text = _TAG_RE.sub(" ", _html.unescape(text))
+    return " ".join(text.replace("\u2009", " ").replace("\xa0", " ").split())
+
+
+def _is_recipe(node: dict) -> bool:
+    node_type = node.get("@type")
+    if isinstance(node_type, list):
+        return "Recipe" in node_type
+    return node_type == "Recipe"
+
+
+# Walks a JSON-LD payload (object, list or @graph) looking for the Recipe object
+def _find_recipe_node(data) -> Optional[dict]:
+    stack = [data]
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            if _is_recipe(node):
+                return node
+            if "@graph" in node:
+                stack.append(node["@graph"])
+            if isinstance(node.get("mainEntity"), (dict, list)):
+                stack.append(node["mainEntity"])
+    return None
+
+
+# Returns the schema.org Recipe object embedded in the page, or None if there is none
+def extract_json_ld_recipe(html: str) -> Optional[dict]:
+    for match in _JSON_LD_RE.finditer(html or ""):
+        try:
+            data = json.loads(match.group(1).strip(), strict=False)
+        except ValueError:
+            continue
+        recipe = _find_recipe_node(data)
+        if recipe is not None:
+            return recipe
+    return None
+
+
+def json_ld_recipe_name(recipe: dict, html: str = "") -> Optional[str]:
+    name = _clean_text(recipe.get("name"))
+    if name:
+        return name
+    match = _TITLE_RE.search(html or "")
+    if match:
+        return _clean_text(match.group(1)) or None
+    return None
+
+
+def ingredients_from_json_ld(recipe: dict) -> list[dict]:
+    lines = recipe.get("recipeIngredient") or recipe.get("ingredients") or []
+    if isinstance(lines, str):
+        lines = [lines]
+
+    ingredients: list[dict] = []
+    for line in lines:
+        item = parse_ingredient_text(_clean_text(line))
+        if item is not None:
+            ingredients.append(item)
+    return ingredients
+
+
+# Flattens recipeInstructions (text, HowToStep or nested HowToSection) into instruction texts
+def _instruction_texts(instructions) -> list[str]:
+    if isinstance(instructions, str):
+        return [instructions]
+    texts = []
+    if isinstance(instructions, dict):
+        if "itemListElement" in instructions:
+            texts.extend(_instruction_texts(instructions["itemListElement"]))
+        elif instructions.get("text"):
+            texts.append(instructions["text"])
+        elif instructions.get("name"):
+            texts.append(instructions["name"])
+    elif isinstance(instructions, list):
+        for item in instructions:
+            texts.extend(_instruction_texts(item))
+    return texts
+
+
+# Splits each instruction into sentence-steps, the same way the HTML path does for <li> items
+def step_descriptions_from_json_ld(recipe: dict) -> list[str]:
+    step_descriptions = []
+    for text in _instruction_texts(recipe.get("recipeInstructions")):
+        text = _clean_text(text)
+        if text:
+            step_descriptions.extend(_split_into_sentences(text))
+    return step_descriptions
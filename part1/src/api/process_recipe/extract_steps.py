@@ -1,7 +1,11 @@
 from typing import Optional
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 import re as _re
 
+from process_recipe.recipe_document import RecipeDocument, parse_recipe_document
+from process_recipe.ingredient_matcher import IngredientMatcher
+
+from process_recipe.step_components.annotate import StepAnnotation, annotate_steps
 from process_recipe.step_components.extract_tools import extract_tools
 from process_recipe.step_components.extract_methods import extract_methods
 from process_recipe.step_components.extract_time_temp import extract_time_info, extract_temperature_info
@@ -32,16 +36,6 @@ def _contains_directions_text(tag: Tag) -> bool:
     return False
 
 
-# Removes stop words (as whole words only) from text
-def _trim_stop_words(text: str) -> str:
-    stop_words = ["in", "and", "or", "of", "an", "a"]
-    pattern = r'\b(' + '|'.join(_re.escape(word) for word in stop_words) + r')\b'
-    result = _re.sub(pattern, '', text, flags=_re.IGNORECASE)
-    result = _re.sub(r'\s+', ' ', result).strip()
-    return result
-
-
-
 '''
 {
     "step_number": int,
@@ -64,7 +58,17 @@ def _trim_stop_words(text: str) -> str:
 '''
 # Extracts steps from the recipe
 def extract_steps(recipe: str, ingredients: list[dict]) -> list[dict]:
-    soup = BeautifulSoup(recipe, "html.parser")
+    return extract_steps_from_document(parse_recipe_document(recipe), ingredients)
+
+
+# Extracts steps from an already parsed recipe page
+def extract_steps_from_document(document: RecipeDocument, ingredients: list[dict]) -> list[dict]:
+    return build_steps(extract_step_descriptions_from_document(document), ingredients)
+
+
+# Finds the directions section of a parsed recipe page and splits it into sentence-steps
+def extract_step_descriptions_from_document(document: RecipeDocument) -> list[str]:
+    soup = document.soup
 
     header: Optional[Tag] = soup.find(
         lambda t: isinstance(t, Tag)  # Is a valid html tag
@@ -143,54 +147,74 @@ def extract_steps(recipe: str, ingredients: list[dict]) -> list[dict]:
         
         # Split into sentences
         step_descriptions = _split_into_sentences(directions_text)
-    
+
+    return step_descriptions
+
+
+# Builds the step dicts (ingredients, tools, methods, time, temperature) from sentence-steps.
+# Each field is computed for all steps by its own function below, so the ingest pipeline
+# (process_recipe/pipeline.py) can cache and rerun them one at a time.
+def build_steps(step_descriptions: list[str], ingredients: list[dict]) -> list[dict]:
     if not step_descriptions:
         return []
-    
-    context={}
 
-    # Loop through each step description
-    steps: list[dict] = []
-    for idx, description in enumerate(step_descriptions, start=1):
+    # Tokenize and tag every step in one batch; tools and methods share the result
+    annotations = annotate_steps(step_descriptions)
 
-        step_ingredients = []
-        trimmed_description = _trim_stop_words(description)
-        for ingredient in ingredients:
-            ingredient_name = ingredient.get("name")
-            if ingredient_name.lower() in trimmed_description:
-                step_ingredients.append(ingredient_name)
-                continue
-            
-            ingredient_name_parts = ingredient_name.lower().split(", ")
-            for part in ingredient_name_parts:
-                if part.lower() in trimmed_description:
-                    step_ingredients.append(part)
+    return assemble_steps(
+        step_descriptions,
+        link_step_ingredients(step_descriptions, ingredients),
+        extract_step_tools(annotations),
+        extract_step_methods(annotations),
+        extract_step_times(step_descriptions),
+        extract_step_temperatures(step_descriptions),
+    )
 
 
-        # NOTE: Main structure, do final output here
-        step = {
-            "step_number": idx,
-            "description": description,
-            "ingredients": step_ingredients,
-            "tools": extract_tools(description),  # TODO implement this function
-            "methods": extract_methods(description),  # TODO implement this function
-            "time": extract_time_info(description)
-        }
+def link_step_ingredients(step_descriptions: list[str], ingredients: list[dict]) -> list[list[str]]:
+    ingredient_matcher = IngredientMatcher(ingredients)
+    return [ingredient_matcher.match(description) for description in step_descriptions]
+
+
+def extract_step_tools(annotations: list[StepAnnotation]) -> list[list[str]]:
+    return [extract_tools(annotation.description, annotation) for annotation in annotations]
+
+
+def extract_step_methods(annotations: list[StepAnnotation]) -> list[list[str]]:
+    return [extract_methods(annotation.description, annotation) for annotation in annotations]
+
+
+def extract_step_times(step_descriptions: list[str]) -> list[dict]:
+    return [extract_time_info(description) for description in step_descriptions]
+
+
+# Temperatures carry over between steps (e.g. "bake" after "preheat the oven to 350 F")
+def extract_step_temperatures(step_descriptions: list[str]) -> list[dict]:
+    context = {}
+    temperatures = []
+    for description in step_descriptions:
         temp_info, ctx_upd = extract_temperature_info(description, context)
-        if temp_info:
-            step["temperature"] = temp_info
+        temperatures.append(temp_info)
         if ctx_upd:
             context.update(ctx_upd)
-
-        if False:  # TODO implement optional temperature extraction
-            step["temperature"] = {
-                "oven": "TEMP_VAL",  # str (optional)
-                "<ingredient>": "TEMP_VAL"  # str (optional)
-            }
+    return temperatures
 
 
+def assemble_steps(step_descriptions: list[str], ingredients: list[list[str]], tools: list[list[str]],
+                   methods: list[list[str]], times: list[dict], temperatures: list[dict]) -> list[dict]:
+    steps: list[dict] = []
+    for idx, description in enumerate(step_descriptions, start=1):
+        # NOTE: Main structure, do final output here
+        step = {
+            "step_number": idx,
+            "description": description,
+            "ingredients": ingredients[idx - 1],
+            "tools": tools[idx - 1],
+            "methods": methods[idx - 1],
+            "time": times[idx - 1]
+        }
+        if temperatures[idx - 1]:
+            step["temperature"] = temperatures[idx - 1]
         steps.append(step)
 
-
-
     return steps
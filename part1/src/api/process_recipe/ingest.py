@@ -0,0 +1,108 @@
+from typing import Optional
+from urllib.parse import urlparse
+import re
+import time
+import requests
+
+import http_client
+
+from process_recipe.pipeline import run_pipeline, pipeline_version
+from process_recipe.recipe_cache import RecipeCache, content_hash
+
+
+# Changes with any pipeline stage version, so cached recipes are recomputed
+EXTRACTION_VERSION = pipeline_version()
+
+allowed_domains = [
+    "foodnetwork.com",
+    "seriouseats.com",
+    "allrecipes.com",
+]
+_URL_PATTERN = re.compile(r"^(https?://)[^\s/$.?#].[^\s]*$", re.IGNORECASE)
+
+
+class RecipeFetchError(Exception):
+    def __init__(self, message: str, detail: Optional[str] = None):
+        super().__init__(message)
+        self.message = message
+        self.detail = detail
+
+
+# Returns an error message if the URL cannot be ingested, None if it is fine
+def validate_recipe_url(url) -> Optional[str]:
+    if not url or not isinstance(url, str):
+        return "Missing or invalid 'url' field"
+
+    # Basic URL format validation
+    if not _URL_PATTERN.match(url):
+        return "Invalid URL format"
+
+    hostname = (urlparse(url).hostname or "").lower()
+    if not any(hostname == d or hostname.endswith("." + d) for d in allowed_domains):
+        return "URL must be from foodnetwork.com, seriouseats.com, or allrecipes.com"
+
+    return None
+
+
+# Extracts the name, ingredients, steps and timeline of a fetched recipe page.
+# With a cache, each pipeline stage's output is cached too (see pipeline.py).
+def extract_recipe_data(html: str, use_json_ld: bool = True, cache: Optional[RecipeCache] = None,
+                        timings: Optional[dict] = None) -> dict:
+    return run_pipeline(html, cache, use_json_ld, timings)
+
+
+# Fetches the page HTML, serving it from the cache while fresh and revalidating
+# it with If-None-Match/If-Modified-Since once it goes stale.
+def fetch_recipe_html(url: str, cache: Optional[RecipeCache] = None) -> dict:
+    entry = cache.get_html(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        return entry
+
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = http_client.get(url, headers=headers)
+    except requests.RequestException as e:
+        raise RecipeFetchError("Failed to fetch URL", str(e))
+
+    if response.status_code == 304 and entry:
+        return cache.mark_revalidated(url, entry)
+
+    if response.status_code < 200 or response.status_code >= 300:
+        raise RecipeFetchError(f"Upstream returned status {response.status_code}")
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if cache:
+        return cache.put_html(url, response.text, etag, last_modified)
+    return {"url": url, "html": response.text, "content_hash": content_hash(response.text),
+            "etag": etag, "last_modified": last_modified}
+
+
+# Key of the extracted recipe for a cached page
+def recipe_data_key(entry: dict) -> str:
+    return f"{entry['content_hash']}-{EXTRACTION_VERSION}"
+
+
+# Fetches and extracts a recipe. A repeat load of an unchanged page is served
+# entirely from the cache: no network request and no NLTK work.
+# Stage timings are recorded into `timings` if given.
+def load_recipe_data(url: str, cache: Optional[RecipeCache] = None, timings: Optional[dict] = None) -> dict:
+    timings = {} if timings is None else timings
+
+    start = time.perf_counter()
+    entry = fetch_recipe_html(url, cache)
+    timings["fetch"] = {"seconds": round(time.perf_counter() - start, 4)}
+    key = recipe_data_key(entry)
+
+    recipe_data = cache.get_recipe_data(key) if cache else None
+    if recipe_data is None:
+        recipe_data = extract_recipe_data(entry["html"], cache=cache, timings=timings)
+        if cache:
+            cache.put_recipe_data(key, recipe_data)
+    return recipe_data
@@ -0,0 +1,96 @@
+import re
+
+from aho_corasick import AhoCorasick
+
+
+# Small words that are ignored on both sides when comparing ingredient names to steps
+# (so "cream of tartar" is found in "add the cream tartar")
+STOP_WORDS = {"in", "and", "or", "of", "an", "a"}
+
+_WORD_RE = re.compile(r"\w+(?:['’-]\w+)*")
+
+
+# Splits text into lowercase words (minus stop words), joined by single spaces.
+# Also returns each kept word's (start, end) in the normalized string and in the original text.
+def _normalize(text: str) -> tuple[str, list[tuple[int, int, int, int]]]:
+    words = []
+    offsets = []
+    position = 0
+    for m in _WORD_RE.finditer(text.lower()):
+        word = m.group(0)
+        if word in STOP_WORDS:
+            continue
+        if words:
+            position += 1
+        words.append(word)
+        offsets.append((position, position + len(word), m.start(), m.end()))
+        position += len(word)
+    return " ".join(words), offsets
+
+
+# Finds the recipe's ingredients in step descriptions.
+# All ingredient names (and, for names like "onion, chopped", each comma-separated part)
+# are compiled once per recipe into a single automaton, so each step is scanned once
+# no matter how many ingredients the recipe has. Matches only count on whole words.
+class IngredientMatcher:
+    def __init__(self, ingredients: list[dict]):
+        # normalized alias -> [(ingredient index, label to report)]
+        self._aliases: dict[str, list[tuple[int, str]]] = {}
+        self._names: list[str] = []
+        self._parts: list[list[str]] = []
+
+        for index, ingredient in enumerate(ingredients):
+            name = ingredient.get("name") or ""
+            parts = name.lower().split(", ")
+            if len(parts) == 1:
+                parts = []
+            self._names.append(name)
+            self._parts.append(parts)
+
+            self._add_alias(name, index, name)
+            for part in parts:
+                self._add_alias(part, index, part)
+
+        self._automaton = AhoCorasick(self._aliases)
+
+    def _add_alias(self, text: str, index: int, label: str):
+        alias, _ = _normalize(text)
+        if alias and (index, label) not in self._aliases.get(alias, []):
+            self._aliases.setdefault(alias, []).append((index, label))
+
+    # Every ingredient mention in the text, as (start, end, ingredient index, label),
+    # with start/end giving the mention's position in the original text
+    def find_mentions(self, text: str) -> list[tuple[int, int, int, str]]:
+        normalized, offsets = _normalize(text)
+        word_starts = {start: i for i, (start, _, _, _) in enumerate(offsets)}
+        word_ends = {end: i for i, (_, end, _, _) in enumerate(offsets)}
+
+        mentions = []
+        for start, end, alias in self._automaton.iter_matches(normalized):
+            # Whole words only
+            if start not in word_starts or end not in word_ends:
+                continue
+            span_start = offsets[word_starts[start]][2]
+            span_end = offsets[word_ends[end]][3]
+            for index, label in self._aliases[alias]:
+                mentions.append((span_start, span_end, index, label))
+        return mentions
+
+    # Names of the ingredients used in a step, in ingredient list order. An ingredient
+    # is listed by its full name if that appears, otherwise by each of its parts that do.
+    def match(self, text: str) -> list[str]:
+        full_names: dict[int, str] = {}
+        found_parts: dict[int, set[str]] = {}
+        for _, _, index, label in self.find_mentions(text):
+            if label == self._names[index]:
+                full_names[index] = label
+            else:
+                found_parts.setdefault(index, set()).add(label)
+
+        matched = []
+        for index in sorted(set(full_names) | set(found_parts)):
+            if index in full_names:
+                matched.append(full_names[index])
+            else:
+                matched.extend(part for part in self._parts[index] if part in found_parts[index])
+        return matched
@@ -0,0 +1,149 @@
+from typing import Callable, Optional
+import hashlib
+import json
+import time
+
+from process_recipe.recipe_document import parse_recipe_document
+from process_recipe.extract_ingredients import extract_ingredients_from_document
+from process_recipe.extract_steps import (
+    extract_step_descriptions_from_document,
+    link_step_ingredients,
+    extract_step_tools,
+    extract_step_methods,
+    extract_step_times,
+    extract_step_temperatures,
+    assemble_steps,
+)
+from process_recipe.extract_json_ld import (
+    extract_json_ld_recipe,
+    json_ld_recipe_name,
+    ingredients_from_json_ld,
+    step_descriptions_from_json_ld,
+)
+from process_recipe.recipe_cache import RecipeCache
+from process_recipe.step_components.annotate import StepAnnotation, annotate_steps
+from process_recipe.step_components.lexicons import section_version
+from process_recipe.timeline import build_timeline
+
+
+# Recipe extraction as a chain of explicit stages:
+#   parse -> annotate -> link_ingredients / tools / methods / time / temperature -> timeline
+# Every stage's output is cached under a hash of its name, version and inputs, so when one
+# extractor changes only the stages downstream of it are recomputed: a new tool lexicon
+# reruns "tools" over the stored pages, and everything else is read back from the cache.
+# Bump a stage's version whenever its output changes. The tools and methods stages also
+# carry a fingerprint of the lexicon section they read, so editing the tool words only
+# reruns "tools".
+class Stage:
+    def __init__(self, name: str, version: str, run: Callable):
+        self.name = name
+        self.version = version
+        self.run = run
+
+
+# Name, ingredients and sentence-steps of a page. Pages that embed a schema.org Recipe
+# in JSON-LD are read straight from that JSON without building a DOM; the heuristic
+# HTML walk is only used when it is missing.
+def parse_recipe_html(html: str, use_json_ld: bool = True) -> dict:
+    if use_json_ld:
+        json_ld = extract_json_ld_recipe(html)
+        if json_ld is not None:
+            ingredients = ingredients_from_json_ld(json_ld)
+            step_descriptions = step_descriptions_from_json_ld(json_ld)
+            if ingredients and step_descriptions:
+                return {
+                    "name": json_ld_recipe_name(json_ld, html),
+                    "ingredients": ingredients,
+                    "step_descriptions": step_descriptions,
+                    "source": "json-ld",
+                }
+
+    # Parse the page once and share the tree across all extractors
+    document = parse_recipe_document(html)
+    return {
+        "name": document.get_title(),
+        "ingredients": extract_ingredients_from_document(document),
+        "step_descriptions": extract_step_descriptions_from_document(document),
+        "source": "html",
+    }
+
+
+def _annotate(step_descriptions: list[str]) -> list[list]:
+    return [annotation.tagged_sentences for annotation in annotate_steps(step_descriptions)]
+
+
+def _annotations(step_descriptions: list[str], tagged: list[list]) -> list[StepAnnotation]:
+    return [StepAnnotation(description, sentences) for description, sentences in zip(step_descriptions, tagged)]
+
+
+STAGES = {
+    stage.name: stage for stage in [
+        Stage("parse", "2", parse_recipe_html),
+        Stage("annotate", "1", _annotate),
+        Stage("link_ingredients", "1", link_step_ingredients),
+        Stage("tools", f"1.{section_version('kitchen_tools')}", lambda descriptions, tagged: extract_step_tools(_annotations(descriptions, tagged))),
+        Stage("methods", f"1.{section_version('cooking_methods')}", lambda descriptions, tagged: extract_step_methods(_annotations(descriptions, tagged))),
+        Stage("time", "2", extract_step_times),
+        Stage("temperature", "1", extract_step_temperatures),
+        Stage("timeline", "3", build_timeline),
+    ]
+}
+
+
+# Version of the pipeline as a whole, changes whenever any stage version does
+def pipeline_version() -> str:
+    versions = json.dumps({name: stage.version for name, stage in STAGES.items()}, sort_keys=True)
+    return hashlib.sha256(versions.encode("utf-8")).hexdigest()[:12]
+
+
+def _stage_key(stage: Stage, inputs: tuple) -> str:
+    payload = json.dumps([stage.name, stage.version, inputs], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Runs one stage, reading its output from the cache when it has been computed before
+def _run_stage(name: str, inputs: tuple, cache: Optional[RecipeCache], timings: dict):
+    stage = STAGES[name]
+    start = time.perf_counter()
+
+    key = _stage_key(stage, inputs) if cache else None
+    output = cache.get_stage(name, key) if cache else None
+    cached = output is not None
+    if not cached:
+        output = stage.run(*inputs)
+        if cache:
+            cache.put_stage(name, key, output)
+
+    timings[name] = {"seconds": round(time.perf_counter() - start, 4), "cached": cached}
+    return output
+
+
+# Extracts a recipe from page HTML stage by stage. Per-stage timings (and whether the
+# stage was served from the cache) are recorded into `timings` if given.
+def run_pipeline(html: str, cache: Optional[RecipeCache] = None, use_json_ld: bool = True,
+                 timings: Optional[dict] = None) -> dict:
+    timings = {} if timings is None else timings
+
+    parsed = _run_stage("parse", (html, use_json_ld), cache, timings)
+    descriptions = parsed["step_descriptions"]
+
+    if descriptions:
+        tagged = _run_stage("annotate", (descriptions,), cache, timings)
+        steps = assemble_steps(
+            descriptions,
+            _run_stage("link_ingredients", (descriptions, parsed["ingredients"]), cache, timings),
+            _run_stage("tools", (descriptions, tagged), cache, timings),
+            _run_stage("methods", (descriptions, tagged), cache, timings),
+            _run_stage("time", (descriptions,), cache, timings),
+            _run_stage("temperature", (descriptions,), cache, timings),
+        )
+    else:
+        steps = []
+
+    return {
+        "name": parsed["name"],
+        "ingredients": parsed["ingredients"],
+        "steps": steps,
+        "timeline": _run_stage("timeline", (steps,), cache, timings),
+        "source": parsed["source"],
+    }
@@ -1,10 +1,18 @@
+from process_recipe.timeline import build_timeline
+
+
 class RecipeNode:
-    def __init__(self, 
-            step_number: int, description: str, 
-            ingredients: list[dict], tools: list[dict], 
-            methods: list[dict], time: dict, temperature: dict, 
-            previous: 'RecipeNode', next: 'RecipeNode'
+    __slots__ = (
+        "index", "step_number", "description", "ingredients",
+        "tools", "methods", "time", "temperature",
+    )
+
+    def __init__(self,
+            index: int, step_number: int, description: str,
+            ingredients: list[dict], tools: list[dict],
+            methods: list[dict], time: dict, temperature: dict
     ):
+        self.index = index  # Position in Recipe's step array
         self.step_number = step_number
         self.description = description
         self.ingredients = ingredients
@@ -12,39 +20,39 @@ class RecipeNode:
         self.methods = methods
         self.time = time
         self.temperature = temperature
-        self.previous = previous
-        self.next = next
-    
 
+    # Same shape as the step dicts produced by extract_steps
+    def to_dict(self) -> dict:
+        step = {
+            "step_number": self.step_number,
+            "description": self.description,
+            "ingredients": self.ingredients,
+            "tools": self.tools,
+            "methods": self.methods,
+            "time": self.time,
+        }
+        if self.temperature:
+            step["temperature"] = self.temperature
+        return step
+
+
+# Steps are held once, in an array of slotted RecipeNode records, and the cursor is
+# an index into it, so moving between steps or jumping to step n is O(1).
 class Recipe:
-    def __init__(self, name: str, url: str, ingredients: list[dict], steps: list[dict]):
+    def __init__(self, name: str, url: str, ingredients: list[dict], steps: list[dict], timeline: dict = None):
         self.name = name
         self.url = url
         self.ingredients = ingredients
-        self.steps = steps
-
-        self.current_step = self.create_nodes(steps)
-        self.first_step = self.current_step
-
-    def create_nodes(self, steps: list[dict]) -> RecipeNode:
-
-        step_one = steps[0]
-
-        root_node = RecipeNode(
-            step_number=step_one["step_number"],
-            description=step_one["description"],
-            ingredients=step_one["ingredients"],
-            tools=step_one["tools"],
-            methods=step_one["methods"],
-            time=step_one["time"],
-            temperature=step_one.get("temperature", {}),
-            previous=None,
-            next=None
-        )
-
-        current_node = root_node
-        for step in steps[1:]:
-            current_node.next = RecipeNode(
+        # Precomputed at ingest (see build_timeline); built here for recipes that lack it
+        self.timeline = timeline or build_timeline(steps)
+
+        self._nodes = self.create_nodes(steps)
+        self._current = 0
+
+    def create_nodes(self, steps: list[dict]) -> list[RecipeNode]:
+        return [
+            RecipeNode(
+                index=index,
                 step_number=step["step_number"],
                 description=step["description"],
                 ingredients=step["ingredients"],
@@ -52,16 +60,30 @@ class Recipe:
                 methods=step["methods"],
                 time=step["time"],
                 temperature=step.get("temperature", {}),
-                previous=current_node,
-                next=None
             )
-            current_node = current_node.next
+            for index, step in enumerate(steps)
+        ]
+
+    # Dict view of the steps, built on demand rather than stored alongside the nodes
+    @property
+    def steps(self) -> list[dict]:
+        return [node.to_dict() for node in self._nodes]
+
+    @property
+    def current_step(self) -> RecipeNode:
+        return self._nodes[self._current] if self._nodes else None
 
-        return root_node
+    @current_step.setter
+    def current_step(self, node: RecipeNode):
+        self._current = node.index
+
+    @property
+    def first_step(self) -> RecipeNode:
+        return self._nodes[0] if self._nodes else None
 
     def get_name(self) -> str:
         return self.name
-    
+
     def get_url(self) -> str:
         return self.url
 
@@ -73,22 +95,21 @@ class Recipe:
 
     def step_forward(self) -> tuple[RecipeNode, bool]:
         stepped = False
-        if self.current_step.next is not None:
-            self.current_step = self.current_step.next
+        if self._current + 1 < len(self._nodes):
+            self._current += 1
             stepped = True
         return self.current_step, stepped
 
     def step_backward(self) -> tuple[RecipeNode, bool]:
         stepped = False
-        if self.current_step.previous is not None:
-            self.current_step = self.current_step.previous
+        if self._current > 0:
+            self._current -= 1
             stepped = True
         return self.current_step, stepped
-    
+
     def nth_step(self, step_number: int) -> RecipeNode:
-        current_step = self.first_step
-        for i in range(step_number - 1):
-            if current_step.next is None:
-                return None
-            current_step = current_step.next
-        return current_step
\ No newline at end of file
+        # Step numbers below 1 resolve to the first step
+        index = max(step_number, 1) - 1
+        if index >= len(self._nodes):
+            return None
+        return self._nodes[index]
@@ -0,0 +1,212 @@
+from typing import Iterator, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+# Normalizes a recipe URL so that trivially different links share one cache entry:
+# lowercase scheme/host, no fragment, no tracking parameters, sorted query, no trailing slash.
+def normalize_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_")
+    )
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse((
+        parsed.scheme.lower(),
+        parsed.netloc.lower(),
+        path,
+        "",
+        urlencode(query),
+        "",
+    ))
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+# Persistent cache for recipe ingestion.
+#  - html layer:    normalized URL -> raw page HTML + ETag/Last-Modified for conditional revalidation
+#  - recipes layer: content hash   -> extracted ingredients/steps JSON
+#  - stages layer:  stage + input hash -> output of one ingest pipeline stage (see pipeline.py)
+# Entries are evicted when they have not been used for max_age_seconds, and the least
+# recently used entries are dropped whenever the cache grows past max_bytes.
+# Writes only update a running total of the cache size; the directories are scanned (and
+# the total recounted) when it crosses max_bytes, or every sweep_seconds for expired entries.
+# A size-triggered scan trims the cache to 90% of max_bytes so the next one is not due
+# right after.
+class RecipeCache:
+    def __init__(self, directory: str, ttl_seconds: int = 86400,
+                 max_age_seconds: int = 30 * 86400, max_bytes: int = 200 * 1024 * 1024,
+                 sweep_seconds: int = 3600):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.sweep_seconds = sweep_seconds
+        self._lock = threading.Lock()
+        # Unknown until the first scan
+        self._size: Optional[int] = None
+        self._next_sweep = 0.0
+
+        os.makedirs(os.path.join(directory, "html"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "recipes"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "stages"), exist_ok=True)
+
+    # The lock cannot be pickled; recreate it so the cache can be handed to worker processes
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _html_path(self, url: str) -> str:
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "html", f"{key}.json")
+
+    def _recipe_path(self, key: str) -> str:
+        return os.path.join(self.directory, "recipes", f"{key}.json")
+
+    def _stage_path(self, stage: str, key: str) -> str:
+        return os.path.join(self.directory, "stages", f"{stage}-{key}.json")
+
+    def _read(self, path: str) -> Optional[dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def _write(self, path: str, entry: dict):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        size = os.path.getsize(tmp_path)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += size - replaced
+            due = self._size is None or self._size > self.max_bytes or time.time() >= self._next_sweep
+        if due:
+            self.evict()
+
+    # Raw HTML layer
+
+    def get_html(self, url: str) -> Optional[dict]:
+        return self._read(self._html_path(url))
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+
+    def put_html(self, url: str, html: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> dict:
+        entry = {
+            "url": normalize_url(url),
+            "html": html,
+            "content_hash": content_hash(html),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        self._write(self._html_path(url), entry)
+        return entry
+
+    # Every stored page, e.g. to re-extract the whole corpus after an extractor changes
+    def iter_html(self) -> Iterator[dict]:
+        html_dir = os.path.join(self.directory, "html")
+        for name in sorted(os.listdir(html_dir)):
+            if name.endswith(".json"):
+                entry = self._read(os.path.join(html_dir, name))
+                if entry is not None:
+                    yield entry
+
+    # Called after the origin answered 304 Not Modified
+    def mark_revalidated(self, url: str, entry: dict) -> dict:
+        entry["fetched_at"] = time.time()
+        self._write(self._html_path(url), entry)
+        return entry
+
+    # Extracted recipe layer
+
+    def get_recipe_data(self, key: str) -> Optional[dict]:
+        entry = self._read(self._recipe_path(key))
+        return entry["data"] if entry else None
+
+    def put_recipe_data(self, key: str, data: dict):
+        self._write(self._recipe_path(key), {"created_at": time.time(), "data": data})
+
+    # Pipeline stage layer
+
+    def get_stage(self, stage: str, key: str):
+        entry = self._read(self._stage_path(stage, key))
+        return entry["data"] if entry else None
+
+    def put_stage(self, stage: str, key: str, data):
+        self._write(self._stage_path(stage, key), {"created_at": time.time(), "data": data})
+
+    # Eviction
+
+    def evict(self):
+        with self._lock:
+            now = time.time()
+            files = []
+            for layer in ("html", "recipes", "stages"):
+                layer_dir = os.path.join(self.directory, layer)
+                for name in os.listdir(layer_dir):
+                    if not name.endswith(".json"):
+                        continue
+                    path = os.path.join(layer_dir, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    if now - stat.st_mtime > self.max_age_seconds:
+                        self._remove(path)
+                    else:
+                        files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            # Drop least recently used entries until the cache fits, with some headroom
+            if total > self.max_bytes:
+                target = self.max_bytes * 0.9
+                for _, size, path in sorted(files):
+                    if total <= target:
+                        break
+                    self._remove(path)
+                    total -= size
+            self._size = total
+            self._next_sweep = now + self.sweep_seconds
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+
+# Cache configured from the environment (.env), shared by the API and the bulk ingest CLI
+def recipe_cache_from_env() -> RecipeCache:
+    return RecipeCache(
+        os.getenv("RECIPE_CACHE_DIR", ".recipe_cache"),
+        ttl_seconds=int(os.getenv("RECIPE_CACHE_TTL", 86400)),
+        max_bytes=int(os.getenv("RECIPE_CACHE_MAX_BYTES", 200 * 1024 * 1024)),
+    )
@@ -0,0 +1,33 @@
+from typing import Optional
+from bs4 import BeautifulSoup
+
+
+# Titles that are too generic to be used as the recipe name
+_GENERIC_TITLES = ['untitled', 'recipe', 'foodnetwork.com']
+
+
+# A fetched recipe page parsed once, shared by every extractor.
+# The extractors only read from the tree, so it is safe to reuse the same soup.
+class RecipeDocument:
+    def __init__(self, soup: BeautifulSoup):
+        self.soup = soup
+
+    def get_title(self) -> Optional[str]:
+        soup = self.soup
+
+        # Try to get the name of the page (recipe)
+        recipe_name = None
+        if soup.title:
+            recipe_name = soup.title.get_text(strip=True)
+        # Try other selectors if title is absent or looks generic
+        if not recipe_name or recipe_name.lower() in _GENERIC_TITLES:
+            # Try h1 or class/id commonly used for recipe titles
+            h1 = soup.find('h1')
+            if h1 and h1.get_text(strip=True):
+                recipe_name = h1.get_text(strip=True)
+
+        return recipe_name
+
+
+def parse_recipe_document(html: str) -> RecipeDocument:
+    return RecipeDocument(BeautifulSoup(html, "html.parser"))
@@ -1,62 +1,70 @@
 # process_recipe/step_components/extract_methods.py
-import nltk
-from nltk import word_tokenize, pos_tag
-from nltk.corpus import wordnet as wn
-from nltk.stem import WordNetLemmatizer
-
-nltk.download('punkt', quiet=True)
-nltk.download('averaged_perceptron_tagger', quiet=True)
-nltk.download('wordnet', quiet=True)
-nltk.download('omw-1.4', quiet=True)
-
-def collect_hyponyms(root):
-    items = set()
-    stack = [root]
-    while stack:
-        node = stack.pop()
-        for h in node.hyponyms():
-            items.add(h)
-            stack.append(h)
-    return items
-
-def safe_synset(name):
-    try:
-        return wn.synset(name)
-    except:
-        return None
-
-ROOTS = list(filter(None, [
-    safe_synset("cook.v.01"),
-    safe_synset("prepare.v.01"),
-    safe_synset("mix.v.01"),
-    safe_synset("heat.v.01"),
-]))
-
-def build_method_list():
-    synsets = set()
-    for root in ROOTS:
-        synsets.update(collect_hyponyms(root))
-
-    verbs = set()
-    for syn in synsets:
-        for lemma in syn.lemmas():
-            word = lemma.name().replace("_", " ").lower()
-            if len(word.split()) == 1:
-                verbs.add(word)
-
-    verbs.update([
-        "bake", "boil", "fry", "grill", "saute", "sear", "roast", "toast",
-        "stir", "mix", "combine", "whisk", "pour", "serve", "transfer",
-        "knead", "slice", "chop", "mince", "fold", "season", "drain",
-        "cover", "uncover", "simmer", "heat", "preheat", "blend", "spread",
-        "coat", "melt", "beat", "cool", "press", "add", "remove"
-    ])
-    return verbs
-
-COOKING_METHODS = set(build_method_list())
-lemmatizer = WordNetLemmatizer()
-
-def _find_best_match(word: str, methods: set[str]) -> str | None:
+from typing import Optional
+
+from process_recipe.step_components.annotate import StepAnnotation, annotate_step
+from process_recipe.step_components.nlp import lemmatize
+from process_recipe.step_components.lexicons import cooking_methods
+
+_END = ""  # Trie key marking the end of a method (never a real character)
+
+
+# The cooking method lexicon compiled into a prefix trie, so the two prefix queries
+# _find_best_match needs cost O(len(word)) instead of a scan over every method
+class MethodLexicon:
+    def __init__(self, methods):
+        self._methods = frozenset(methods)
+        self._root: dict = {}
+        for method in self._methods:
+            node = self._root
+            for ch in method:
+                node = node.setdefault(ch, {})
+            node[_END] = True
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._methods
+
+    # Longest method that is a proper prefix of word (e.g. "preheat" for "preheating")
+    def longest_prefix_of(self, word: str) -> Optional[str]:
+        node = self._root
+        longest = None
+        for i, ch in enumerate(word[:-1]):
+            node = node.get(ch)
+            if node is None:
+                break
+            if _END in node:
+                longest = word[:i + 1]
+        return longest
+
+    # Alphabetically first method that extends word (e.g. "heating" for "heat")
+    def first_extension_of(self, word: str) -> Optional[str]:
+        node = self._root
+        for ch in word:
+            node = node.get(ch)
+            if node is None:
+                return None
+
+        chars = []
+        while _END not in node or not chars:
+            children = [ch for ch in node if ch != _END]
+            if not children:
+                return None
+            ch = min(children)
+            chars.append(ch)
+            node = node[ch]
+        return word + "".join(chars)
+
+
+_method_lexicon: Optional[MethodLexicon] = None
+
+
+def method_lexicon() -> MethodLexicon:
+    global _method_lexicon
+    if _method_lexicon is None:
+        _method_lexicon = MethodLexicon(cooking_methods())
+    return _method_lexicon
+
+
+def _find_best_match(word: str, methods: MethodLexicon) -> str | None:
     word_lower = word.lower()
     
     # First, try exact match
@@ -64,26 +72,20 @@ def _find_best_match(word: str, methods: set[str]) -> str | None:
         return word_lower
     
     # Try lemmatized form
-    lemma = lemmatizer.lemmatize(word_lower, "v")
+    lemma = lemmatize(word_lower, "v")
     if lemma in methods:
         return lemma
     
-    # Find best closest match - prefer longer matches
-    # This handles cases where a word contains a method as a substring
-    best_match = None
-    best_score = 0
-    
-    for method in methods:
-        # Check if word starts with method (e.g., "preheating" contains "preheat")
-        # We want the longest matching method
-        if word_lower.startswith(method) and len(method) > best_score:
-            best_match = method
-            best_score = len(method)
-        # Check if method starts with word (e.g., word is "heat" and method is "preheat")
-        # This is less common but possible
-        elif method.startswith(word_lower) and len(word_lower) > best_score:
-            best_match = method
-            best_score = len(word_lower)
+    # Find best closest match
+    # A method that starts with the word (e.g., word is "simm" and method is "simmer")
+    # scores len(word), which beats any method that is a prefix of the word, so check it first
+    extension = methods.first_extension_of(word_lower)
+    if extension:
+        best_match, best_score = extension, len(word_lower)
+    else:
+        # Otherwise the longest method the word starts with (e.g., "preheating" contains "preheat")
+        best_match = methods.longest_prefix_of(word_lower)
+        best_score = len(best_match) if best_match else 0
     
     # Only return if we found a reasonably good match (at least 3 characters)
     # This prevents false matches on very short substrings
@@ -92,14 +94,26 @@ def _find_best_match(word: str, methods: set[str]) -> str | None:
     
     return None
 
-def extract_methods(description: str) -> list[str]:
+# Splits a token list into the comma-delimited chunks of the text
+def _comma_chunks(tokens: list[str]) -> list[list[str]]:
+    chunks = [[]]
+    for token in tokens:
+        if token == ",":
+            chunks.append([])
+        else:
+            chunks[-1].append(token)
+    return chunks
+
+# Pass the step's annotation (see annotate_steps) to reuse its tagged tokens
+def extract_methods(description: str, annotation: Optional[StepAnnotation] = None) -> list[str]:
     if not description:
         return []
 
-    description = description.lower()
-    tokens = word_tokenize(description)
-    tagged = pos_tag(tokens)
+    if annotation is None:
+        annotation = annotate_step(description)
+    tagged = [(word.lower(), tag) for word, tag in annotation.tagged]
 
+    known_methods = method_lexicon()
     methods = set()
     processed_words = set()  # Track words we've already processed
 
@@ -107,7 +121,7 @@ def extract_methods(description: str) -> list[str]:
     for word, tag in tagged:
         if tag.startswith("VB"):
             # Try exact match first (word itself or lemmatized form)
-            match = _find_best_match(word, COOKING_METHODS)
+            match = _find_best_match(word, known_methods)
             if match:
                 methods.add(match)
                 processed_words.add(word)
@@ -117,14 +131,12 @@ def extract_methods(description: str) -> list[str]:
     # (e.g., sometimes tagged as NN/NNP at sentence start, though rare)
     # Check the first two words of each comma-delimited chunk (or just that word if chunk is 1 word)
     # This handles imperative verbs that appear at the start of clauses
-    chunks = description.split(',')
-    for chunk in chunks:
-        chunk_tokens = word_tokenize(chunk.strip())
+    for chunk_tokens in _comma_chunks([word for word, _ in tagged]):
         # If chunk has 1 word, check that word; otherwise check first two words
         words_to_check = chunk_tokens[:1] if len(chunk_tokens) == 1 else chunk_tokens[:2]
         for word in words_to_check:
             if word not in processed_words:  # Skip if already processed as a verb
-                match = _find_best_match(word, COOKING_METHODS)
+                match = _find_best_match(word, known_methods)
                 if match:
                     methods.add(match)
                     processed_words.add(word)
@@ -0,0 +1,177 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+from process_recipe.step_components import nlp
+
+
+# The kitchen tool and cooking method word lists used by extract_tools/extract_methods.
+# They are derived from WordNet hyponym trees, which is slow (and needs the NLTK data),
+# so they are built once by
+#     python -m process_recipe.step_components.lexicons
+# and saved to a small versioned JSON artifact that workers read on first use.
+# Bump LEXICON_VERSION whenever the roots or extra words below change.
+LEXICON_VERSION = 1
+LEXICON_PATH = os.getenv(
+    "LEXICON_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicons.json"),
+)
+
+TOOL_ROOTS = [
+    "kitchen_utensil.n.01",
+    "tableware.n.01",
+    "cookware.n.01",
+    "utensil.n.01",
+]
+EXTRA_TOOLS = ["oven"]  # NOTE: Add additional tools as necessary here
+
+METHOD_ROOTS = [
+    "cook.v.01",
+    "prepare.v.01",
+    "mix.v.01",
+    "heat.v.01",
+]
+EXTRA_METHODS = [
+    "bake", "boil", "fry", "grill", "saute", "sear", "roast", "toast",
+    "stir", "mix", "combine", "whisk", "pour", "serve", "transfer",
+    "knead", "slice", "chop", "mince", "fold", "season", "drain",
+    "cover", "uncover", "simmer", "heat", "preheat", "blend", "spread",
+    "coat", "melt", "beat", "cool", "press", "add", "remove"
+]
+
+# What each section of the lexicons is built from
+SECTION_SOURCES = {
+    "kitchen_tools": {"roots": TOOL_ROOTS, "extra": EXTRA_TOOLS},
+    "cooking_methods": {"roots": METHOD_ROOTS, "extra": EXTRA_METHODS, "single_word": True},
+}
+
+
+# Short fingerprint of one section's sources, so a pipeline stage that only reads that
+# section is recomputed when that section changes and not when another one does
+def section_version(section: str) -> str:
+    payload = json.dumps(SECTION_SOURCES[section], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:8]
+
+
+def collect_hyponyms(root):
+    items = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for h in node.hyponyms():
+            items.add(h)
+            stack.append(h)
+    return items
+
+
+def safe_synset(wn, name):
+    try:
+        return wn.synset(name)
+    except Exception:
+        return None
+
+
+def _lemma_words(roots: list[str]) -> set[str]:
+    wn = nlp.wordnet()
+    synsets = set()
+    for root in filter(None, (safe_synset(wn, name) for name in roots)):
+        synsets.update(collect_hyponyms(root))
+
+    # Convert things like "pie-dish" and "frying_pan" to clean tokens
+    return {
+        lemma.name().replace("_", " ").lower()
+        for syn in synsets
+        for lemma in syn.lemmas()
+    }
+
+
+def build_kitchen_tools() -> list[str]:
+    return sorted(_lemma_words(TOOL_ROOTS) | set(EXTRA_TOOLS))
+
+
+def build_cooking_methods() -> list[str]:
+    # Single-word verbs only
+    verbs = {word for word in _lemma_words(METHOD_ROOTS) if len(word.split()) == 1}
+    return sorted(verbs | set(EXTRA_METHODS))
+
+
+def build_lexicons() -> dict:
+    return {
+        "version": LEXICON_VERSION,
+        "kitchen_tools": build_kitchen_tools(),
+        "cooking_methods": build_cooking_methods(),
+    }
+
+
+def write_lexicons(lexicons: dict, path: str = LEXICON_PATH):
+    # Unique per process and thread, so workers rebuilding at the same time never replace
+    # the artifact with each other's half-written file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(lexicons, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def read_lexicons(path: str = LEXICON_PATH) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lexicons = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Artifacts from an older build are ignored
+    if lexicons.get("version") != LEXICON_VERSION:
+        return None
+    return lexicons
+
+
+_lexicons: Optional[dict[str, frozenset[str]]] = None
+_lock = threading.Lock()
+
+
+# Loads the lexicons on first use: from the artifact if there is a current one,
+# otherwise by walking WordNet (and saving the result for the next process)
+def get_lexicons() -> dict[str, frozenset[str]]:
+    global _lexicons
+    if _lexicons is None:
+        with _lock:
+            if _lexicons is None:
+                lexicons = read_lexicons()
+                if lexicons is None:
+                    lexicons = build_lexicons()
+                    try:
+                        write_lexicons(lexicons)
+                    except OSError:
+                        pass
+                _lexicons = {
+                    "kitchen_tools": frozenset(lexicons["kitchen_tools"]),
+                    "cooking_methods": frozenset(lexicons["cooking_methods"]),
+                }
+    return _lexicons
+
+
+def kitchen_tools() -> frozenset[str]:
+    return get_lexicons()["kitchen_tools"]
+
+
+def cooking_methods() -> frozenset[str]:
+    return get_lexicons()["cooking_methods"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the kitchen tool and cooking method lexicons from WordNet.")
+    parser.add_argument("--output", default=LEXICON_PATH, help="Where to write the lexicon artifact.")
+    args = parser.parse_args()
+
+    lexicons = build_lexicons()
+    write_lexicons(lexicons, args.output)
+    print(
+        f"Wrote {len(lexicons['kitchen_tools'])} kitchen tools and "
+        f"{len(lexicons['cooking_methods'])} cooking methods to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import threading
+
+
+# Lazy access to the NLTK functions the step extractors use.
+# NLTK is imported (and its models loaded) on the first call rather than at import time,
+# and a data package is only downloaded if it turns out to be missing.
+
+# NLTK data package -> resource path used to check whether it is installed
+_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "averaged_perceptron_tagger": "taggers/averaged_perceptron_tagger",
+    "wordnet": "corpora/wordnet",
+    "omw-1.4": "corpora/omw-1.4",
+}
+
+_ready: set[str] = set()
+_lock = threading.Lock()
+_lemmatizer = None
+
+
+def require(*packages: str):
+    import nltk
+
+    for package in packages:
+        if package in _ready:
+            continue
+        with _lock:
+            if package in _ready:
+                continue
+            try:
+                nltk.data.find(_RESOURCES[package])
+            except LookupError:
+                nltk.download(package, quiet=True)
+            _ready.add(package)
+
+
+def sent_tokenize(text: str) -> list[str]:
+    require("punkt")
+    from nltk import sent_tokenize as _sent_tokenize
+    return _sent_tokenize(text)
+
+
+def word_tokenize(text: str) -> list[str]:
+    require("punkt")
+    from nltk import word_tokenize as _word_tokenize
+    return _word_tokenize(text)
+
+
+def pos_tag(tokens: list[str]) -> list[tuple[str, str]]:
+    require("averaged_perceptron_tagger")
+    from nltk import pos_tag as _pos_tag
+    return _pos_tag(tokens)
+
+
+# Tags many token lists in one call to the tagger
+def pos_tag_sents(sentences: list[list[str]]) -> list[list[tuple[str, str]]]:
+    require("averaged_perceptron_tagger")
+    from nltk import pos_tag_sents as _pos_tag_sents
+    return _pos_tag_sents(sentences)
+
+
+def lemmatize(word: str, pos: str = "n") -> str:
+    global _lemmatizer
+    if _lemmatizer is None:
+        require("wordnet", "omw-1.4")
+        from nltk.stem import WordNetLemmatizer
+        _lemmatizer = WordNetLemmatizer()
+    return _lemmatizer.lemmatize(word, pos)
+
+
+def wordnet():
+    require("wordnet", "omw-1.4")
+    from nltk.corpus import wordnet as wn
+    return wn
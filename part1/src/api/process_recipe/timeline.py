@@ -0,0 +1,87 @@
+import re
+
+
+# Steps where the food mostly sits (in the oven, fridge, on the stove) and the cook is free
+PASSIVE_METHODS = {
+    "bake", "roast", "broil", "chill", "refrigerate", "freeze", "rest", "simmer",
+    "braise", "marinate", "rise", "proof", "cool", "steep", "soak", "stand",
+}
+_PASSIVE_RE = re.compile(
+    r"\b(bake[sd]?|baking|roast(?:ed|ing)?|chill(?:ed|ing)?|refrigerat(?:e|ed|ing)|freez(?:e|ing)|"
+    r"let\s+(?:it\s+)?rest|rest(?:ed|ing)?\s+for|simmer(?:ed|ing)?|braise[sd]?|marinat(?:e|ed|ing)|rise|proof|"
+    r"cool(?:ed|ing)?|steep|soak|let\s+(?:it\s+)?stand|set\s+aside)\b",
+    re.I,
+)
+# Cues that a step is done while the previous one is still going
+_OVERLAP_RE = re.compile(r"\b(meanwhile|while)\b", re.I)
+
+
+def _is_passive(step: dict) -> bool:
+    if PASSIVE_METHODS.intersection(step.get("methods") or []):
+        return True
+    return bool(_PASSIVE_RE.search(step.get("description", "")))
+
+
+# Time the step takes, 0 if it has none. The times mentioned in a step are done one after
+# another ("cook 5 minutes, then bake 20 minutes" is 25 minutes), each at the upper end of
+# its range (30 min for "bake 25-30 minutes"), and twice when it is per side.
+def _duration_seconds(step: dict) -> int:
+    time_info = step.get("time") or {}
+    mentions = time_info.get("mentions")
+    if not mentions:
+        return int(time_info.get("max_seconds") or time_info.get("min_seconds") or 0)
+
+    total = 0
+    for mention in mentions:
+        seconds = int(mention.get("max_s") or mention.get("min_s") or 0)
+        total += seconds * 2 if mention.get("per_side") else seconds
+    return total
+
+
+# Builds the recipe's timeline from its steps, once, when the recipe is extracted.
+#  - start_s/end_s: offsets when the steps are done strictly one after another
+#  - scheduled_start_s/scheduled_end_s: offsets when active work is done while a
+#    passive step (baking, chilling, ...) runs. Only active steps marked "meanwhile" or
+#    "while" overlap the passive step; any other step waits for it.
+#  - total_s: length of that schedule (the critical path), remaining_s: time from the
+#    start of a step to the end of the recipe, so both questions are a lookup
+def build_timeline(steps: list[dict]) -> dict:
+    entries = []
+    elapsed = 0
+    cook_free_at = 0      # When the cook can start the next step
+    passive_until = 0     # When the running passive steps are finished
+
+    for step in steps:
+        duration = _duration_seconds(step)
+        passive = _is_passive(step)
+
+        overlaps = not passive and bool(_OVERLAP_RE.search(step.get("description", "")))
+        start = cook_free_at if overlaps else max(cook_free_at, passive_until)
+        end = start + duration
+        if passive:
+            # The cook only has to start a passive step
+            cook_free_at = start
+            passive_until = max(passive_until, end)
+        else:
+            cook_free_at = end
+
+        entries.append({
+            "step_number": step.get("step_number"),
+            "duration_s": duration,
+            "passive": passive,
+            "start_s": elapsed,
+            "end_s": elapsed + duration,
+            "scheduled_start_s": start,
+            "scheduled_end_s": end,
+        })
+        elapsed += duration
+
+    total = max(cook_free_at, passive_until)
+    for entry in entries:
+        entry["remaining_s"] = total - entry["scheduled_start_s"]
+
+    return {
+        "steps": entries,
+        "sequential_s": elapsed,
+        "total_s": total,
+    }
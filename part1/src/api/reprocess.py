@@ -0,0 +1,69 @@
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from process_recipe.ingest import extract_recipe_data, recipe_data_key
+from process_recipe.recipe_cache import RecipeCache, recipe_cache_from_env
+
+
+def _reprocess_page(html: str, cache: RecipeCache) -> tuple[dict, dict]:
+    timings = {}
+    recipe_data = extract_recipe_data(html, cache=cache, timings=timings)
+    return recipe_data, timings
+
+
+# Re-extracts every page stored in the recipe cache with the current pipeline.
+# Stages whose version and inputs are unchanged are read back from the stage cache,
+# so after e.g. a lexicon change only the affected stages actually run.
+# Yields one summary per page, with the page's stage timings.
+def iter_reprocess(cache: RecipeCache, max_process_workers: Optional[int] = None, force: bool = False):
+    entries = [
+        entry for entry in cache.iter_html()
+        if force or cache.get_recipe_data(recipe_data_key(entry)) is None
+    ]
+
+    with ProcessPoolExecutor(max_workers=max_process_workers) as process_pool:
+        futures = [process_pool.submit(_reprocess_page, entry["html"], cache) for entry in entries]
+        for entry, future in zip(entries, futures):
+            try:
+                recipe_data, timings = future.result()
+            except Exception as e:
+                yield {"url": entry["url"], "status": "error", "error": "Failed to extract recipe", "detail": str(e)}
+                continue
+
+            cache.put_recipe_data(recipe_data_key(entry), recipe_data)
+            yield {"url": entry["url"], "status": "saved", "num_steps": len(recipe_data["steps"]), "timings": timings}
+
+
+# Command line entry point, run after changing an extractor:
+#   python reprocess.py
+# Prints one JSON line per page and a per-stage total at the end.
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-extract all cached recipe pages with the current pipeline.")
+    parser.add_argument("--process-workers", type=int, default=None, help="Extraction processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="Also re-extract pages whose recipe is up to date")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+
+    failed = 0
+    totals = {}
+    for result in iter_reprocess(recipe_cache_from_env(), args.process_workers, args.force):
+        if result["status"] != "saved":
+            failed += 1
+        for stage, timing in result.get("timings", {}).items():
+            total = totals.setdefault(stage, {"seconds": 0.0, "recomputed": 0, "cached": 0})
+            total["seconds"] = round(total["seconds"] + timing["seconds"], 4)
+            total["cached" if timing.get("cached") else "recomputed"] += 1
+        print(json.dumps(result), flush=True)
+
+    print(json.dumps({"stage_totals": totals}), flush=True)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
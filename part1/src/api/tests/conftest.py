@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The API modules import each other from the api directory (e.g. `from process_recipe.x import y`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
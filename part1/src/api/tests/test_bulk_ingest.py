@@ -0,0 +1,28 @@
+import pytest
+
+from bulk_ingest import worker_count, main
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, 8),
+        (4, 4),
+        (100, 32),
+    ],
+)
+def test_worker_count_defaults_and_caps(value, expected):
+    assert worker_count(value, "fetch_workers", 8, 32) == expected
+
+
+@pytest.mark.parametrize("value", [0, -1, True, "4", 2.5])
+def test_worker_count_rejects_non_positive_integers(value):
+    with pytest.raises(ValueError):
+        worker_count(value, "fetch_workers", 8, 32)
+
+
+def test_cli_rejects_zero_workers(capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["--fetch-workers", "0", "--url", "https://example.com/recipe"])
+    assert exc.value.code == 2
+    assert "--fetch-workers must be a positive integer" in capsys.readouterr().err
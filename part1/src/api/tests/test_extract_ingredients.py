@@ -0,0 +1,32 @@
+import pytest
+
+from process_recipe.extract_ingredients import parse_ingredient_text
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Commas between descriptors are not a preparation note
+    ("4 boneless, skinless chicken breasts",
+     {"name": "chicken breasts", "quantity": "4", "measurement": None,
+      "descriptor": "boneless, skinless", "preparation": None}),
+    # "to taste" qualifies the amount, not the ingredient
+    ("salt and ground black pepper to taste",
+     {"name": "salt and ground black pepper", "quantity": None, "measurement": None,
+      "descriptor": None, "preparation": "to taste"}),
+    ("olive oil, or as needed",
+     {"name": "olive oil", "quantity": None, "measurement": None,
+      "descriptor": None, "preparation": "or as needed"}),
+    ("1 cup butter, softened",
+     {"name": "butter", "quantity": "1", "measurement": "cup",
+      "descriptor": None, "preparation": "softened"}),
+    ("1 large onion, finely chopped",
+     {"name": "onion", "quantity": "1", "measurement": None,
+      "descriptor": "large", "preparation": "finely chopped"}),
+    ("2 cups chicken, cooked and shredded, divided",
+     {"name": "chicken", "quantity": "2", "measurement": "cups",
+      "descriptor": None, "preparation": "cooked and shredded, divided"}),
+    ("1 (10 ounce) package frozen peas, thawed",
+     {"name": "peas", "quantity": "1", "measurement": "(10 ounce) package",
+      "descriptor": "frozen", "preparation": "thawed"}),
+])
+def test_parse_ingredient_text(text, expected):
+    assert parse_ingredient_text(text) == expected
@@ -0,0 +1,47 @@
+from process_recipe.step_components.extract_time_temp import extract_time_info
+from process_recipe.timeline import build_timeline
+
+
+def _steps(*descriptions: str, methods=None) -> list[dict]:
+    return [
+        {"step_number": i + 1, "description": description, "methods": (methods or {}).get(i + 1, []),
+         "time": extract_time_info(description)}
+        for i, description in enumerate(descriptions)
+    ]
+
+
+def test_sequential_times_in_a_step_add_up():
+    timeline = build_timeline(_steps("Cook 5 minutes, then bake 20 minutes."))
+    assert timeline["steps"][0]["duration_s"] == 25 * 60
+
+
+def test_per_side_times_count_twice():
+    timeline = build_timeline(_steps("Sear the steaks 4 minutes per side."))
+    assert timeline["steps"][0]["duration_s"] == 8 * 60
+
+
+def test_ranges_use_the_upper_end():
+    timeline = build_timeline(_steps("Simmer for 25-30 minutes."))
+    assert timeline["steps"][0]["duration_s"] == 30 * 60
+
+
+# An active step with its own time still waits for the passive step before it
+def test_active_step_without_cue_waits_for_passive_step():
+    timeline = build_timeline(_steps(
+        "Let the cake cool for 60 minutes.",
+        "Beat the frosting for 5 minutes.",
+    ))
+    frosting = timeline["steps"][1]
+    assert frosting["scheduled_start_s"] == 60 * 60
+    assert timeline["total_s"] == 65 * 60
+
+
+def test_meanwhile_overlaps_passive_step():
+    timeline = build_timeline(_steps(
+        "Bake for 30 minutes.",
+        "Meanwhile, whisk the glaze for 5 minutes.",
+    ))
+    glaze = timeline["steps"][1]
+    assert glaze["scheduled_start_s"] == 0
+    assert timeline["total_s"] == 30 * 60
+    assert timeline["sequential_s"] == 35 * 60
@@ -17,6 +17,9 @@ function isValidUrl(urlStr: string) {
   }
 }
 
+// How often to ask the API whether a recipe ingest job has finished
+const JOB_POLL_INTERVAL_MS = 500;
+
 export default function Home() {
   const [input, setInput] = useState("");
   const [submitting, setSubmitting] = useState(false);
@@ -32,6 +35,39 @@ export default function Home() {
   const [showFadeIn, setShowFadeIn] = useState(false);
   const [isListening, setIsListening] = useState(false);
   const inputRef = useRef<HTMLInputElement>(null);
+  // Session ID issued by the API, sent back on every call so the server keeps our recipe and chat
+  const sessionIdRef = useRef<string | null>(null);
+
+  function apiHeaders(): Record<string, string> {
+    const headers: Record<string, string> = { "Content-Type": "application/json" };
+    if (sessionIdRef.current) {
+      headers["X-Session-ID"] = sessionIdRef.current;
+    }
+    return headers;
+  }
+
+  function rememberSession(res: Response) {
+    const sessionId = res.headers.get("X-Session-ID");
+    if (sessionId) {
+      sessionIdRef.current = sessionId;
+    }
+  }
+
+  // Polls an async /get-recipe job until it has finished, then collects its result
+  // (which also loads the recipe into our session)
+  async function waitForRecipeJob(statusUrl: string, resultUrl: string): Promise<Response> {
+    while (true) {
+      await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+      const statusRes = await fetch(`http://localhost:8080${statusUrl}`, { headers: apiHeaders() });
+      const job = await statusRes.json();
+      if (!statusRes.ok || job.status === "done" || job.status === "error") {
+        break;
+      }
+    }
+    const res = await fetch(`http://localhost:8080${resultUrl}`, { headers: apiHeaders() });
+    rememberSession(res);
+    return res;
+  }
 
   // Trigger fade-in after input box transition completes (500ms)
   useEffect(() => {
@@ -57,9 +93,10 @@ export default function Home() {
     try {
       const res = await fetch("http://localhost:8080/ask-question", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: apiHeaders(),
         body: JSON.stringify({ question }),
       });
+      rememberSession(res);
 
       if (!res.ok) {
         throw new Error("Question service error");
@@ -103,10 +140,11 @@ export default function Home() {
   async function handleReset() {
     try {
       // Call the reset endpoint
-      await fetch("http://localhost:8080/reset", {
+      const res = await fetch("http://localhost:8080/reset", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: apiHeaders(),
       });
+      rememberSession(res);
       
       // Reset all UI state to default
       setInput("");
@@ -194,13 +232,19 @@ export default function Home() {
 
       if (isFirstSubmission) {
         // First submission: URL to get-recipe
+        // Ingest runs as a background job on the server; poll it until the recipe is ready
         res = await fetch("http://localhost:8080/get-recipe", {
           method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ url: input }),
+          headers: apiHeaders(),
+          body: JSON.stringify({ url: input, async: true }),
         });
+        rememberSession(res);
 
         data = await res.json();
+        if (res.status === 202 && data.result_url) {
+          res = await waitForRecipeJob(data.status_url, data.result_url);
+          data = await res.json();
+        }
 
         // Check for error in response
         if (data.error) {
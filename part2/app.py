@@ -1,13 +1,16 @@
 import re
 import os
+import json
 import requests
-from google import genai
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from flask_cors import CORS
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 
+import http_client
 from llm_context import LLM_CONTEXT
+from context_cache import RecipeChatContext
+from llm_provider import llm_provider_from_env
 
 
 app = Flask(__name__)
@@ -16,14 +19,17 @@ CORS(app)
 # Load environment variables from the .env file
 load_dotenv()
 
-# Retrieve the Gemini API key
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise ValueError("GEMINI_API_KEY not found. Please set it in your .env file.")
-
-# Configure the GenAI client
-client = genai.Client()
-chat = client.chats.create(model="gemini-2.5-flash")
+# The LLM provider (LLM_PROVIDER, see llm_provider.py). Gemini's client, and its API key,
+# are only needed once the first request is sent.
+client = llm_provider_from_env()
+# The instructions and the loaded recipe are registered with the model once per recipe;
+# each question is then sent on its own (see context_cache.py)
+recipe_context = RecipeChatContext(
+    client,
+    "gemini-2.5-flash",
+    f"Instructions:{LLM_CONTEXT}",
+    ttl_seconds=int(os.getenv("CONTEXT_CACHE_TTL", 3600)),
+)
 recipe = None
 
 
@@ -50,7 +56,7 @@ def get_recipe():
         return jsonify({"error": "Invalid URL format"}), 400
 
     try:
-        response = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+        response = http_client.get(url, headers={"User-Agent": "Mozilla/5.0"})
     except requests.RequestException as e:
         return jsonify({"error": "Failed to fetch URL", "detail": str(e)}), 502
 
@@ -95,6 +101,9 @@ def get_recipe():
     # Store as global recipe variable
     recipe = recipe_text.strip()
 
+    # Start a chat about the new recipe, with the recipe in its cached context
+    recipe_context.start(f"Recipe: {recipe}")
+
     return jsonify({
         "status": "saved",
         "recipe_url": url,
@@ -110,7 +119,7 @@ def show_recipe():
 
 @app.post("/ask-question")
 def ask_question():
-    global recipe, chat
+    global recipe
 
     data = request.get_json(silent=True) or {}
     question = data.get("question")
@@ -118,14 +127,23 @@ def ask_question():
     if not question:
         return jsonify({"error": "Missing 'question' field"}), 400
     
-    # Build the prompt with context, recipe, and user question
-        # TODO: Provide chat history as context?
-    #  for message in chat.get_history() ...
-    prompt = f"Instructions:{LLM_CONTEXT}\nRecipe: {recipe}\nUser Question: {question}"
+    # The instructions and recipe are already in the chat's cached context,
+    #  so the prompt is just the user question
+    prompt = f"User Question: {question}"
+    chat = recipe_context.chat()
 
     if data.get("nohtml"):
         prompt += "\n\nDo not include any HTML tags in your response."
     
+    # Stream the answer as Server-Sent Events: a "delta" event per chunk as Gemini
+    #  generates it, then an "answer" event with the complete response
+    if data.get("stream"):
+        return Response(
+            stream_with_context(_stream_answer_events(chat, prompt)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     # Send message using the chat session
     response = chat.send_message(prompt)
     
@@ -136,15 +154,33 @@ def ask_question():
     return jsonify(result), 200
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_answer_events(chat, prompt):
+    parts = []
+    try:
+        for chunk in chat.send_message_stream(prompt):
+            if chunk.text:
+                parts.append(chunk.text)
+                yield _sse("delta", {"text": chunk.text})
+    except Exception as e:
+        yield _sse("error", {"error": str(e)})
+        return
+
+    yield _sse("answer", {"answer": "".join(parts), "suggestions": None})
+
+
 @app.post("/reset")
 def reset():
-    global recipe, chat, client
+    global recipe
     
     # Reset the global recipe to None
     recipe = None
     
-    # Create a new chat session to reset the LLM context
-    chat = client.chats.create(model="gemini-2.5-flash")
+    # Create a new chat session (and drop the cached recipe) to reset the LLM context
+    recipe_context.start()
     
     return jsonify({"status": "reset"}), 200
 
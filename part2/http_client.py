@@ -0,0 +1,58 @@
+import os
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Shared HTTP client for every outbound call (recipe pages, Spoonacular, dictionaryapi).
+# One keep-alive session with a connection pool per host, so repeated calls to the same
+# domains reuse their TCP/TLS connections, plus retries with backoff, a default timeout
+# and a cap on concurrent requests per host.
+class HttpClient:
+    def __init__(self, pool_size: int = 10, max_retries: int = 2, backoff_factor: float = 0.3,
+                 timeout: float = 10, max_per_host: int = 4):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            raise_on_status=False,  # Hand the final response back so callers can check the status
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = (urlparse(url).hostname or "").lower()
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_limits[host]
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        with self._host_limit(url):
+            return self.session.get(url, **kwargs)
+
+
+http_client = HttpClient(
+    pool_size=int(os.getenv("HTTP_POOL_SIZE", 10)),
+    max_retries=int(os.getenv("HTTP_MAX_RETRIES", 2)),
+    backoff_factor=float(os.getenv("HTTP_BACKOFF_FACTOR", 0.3)),
+    timeout=float(os.getenv("HTTP_TIMEOUT", 10)),
+    max_per_host=int(os.getenv("HTTP_MAX_PER_HOST", 4)),
+)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return http_client.get(url, **kwargs)
@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Tests never reach Gemini: the app talks to the local provider (see llm_provider.py)
+os.environ["LLM_PROVIDER"] = "local"
+
+# app.py imports its modules from the part2 directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_provider import LocalProvider
+
+
+# The local provider with a gate on streamed replies: while the gate is held only the first
+# chunk of a reply is generated, so a test can check what reached the client before the
+# rest of the reply exists
+class GatedLocalProvider(LocalProvider):
+    def __init__(self):
+        super().__init__()
+        self.chunks_generated = 0
+        self._open = threading.Event()
+        self._open.set()
+
+    def hold(self):
+        self._open.clear()
+
+    def release(self):
+        self._open.set()
+
+    def chunks(self, text: str):
+        for i, chunk in enumerate(super().chunks(text)):
+            if i and not self._open.wait(timeout=10):
+                raise TimeoutError("streamed reply was held and never released")
+            self.chunks_generated += 1
+            yield chunk
+
+
+@pytest.fixture
+def provider():
+    provider = GatedLocalProvider()
+    yield provider
+    provider.release()
+
+
+# sse_events(response) yields (event name, data) for each server-sent event of a streamed
+# response, as it arrives
+@pytest.fixture
+def sse_events():
+    def events(response):
+        for chunk in response.iter_encoded():
+            for block in chunk.decode("utf-8").split("\n\n"):
+                if not block.strip():
+                    continue
+                lines = dict(line.split(": ", 1) for line in block.splitlines())
+                yield lines["event"], json.loads(lines["data"])
+    return events
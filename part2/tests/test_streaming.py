@@ -0,0 +1,44 @@
+import pytest
+
+import app as api
+
+QUESTION = "how long do I toast it?"
+
+
+@pytest.fixture
+def client(provider, monkeypatch):
+    monkeypatch.setattr(api.recipe_context, "client", provider)
+    api.recipe_context.start("Recipe: toast")
+    yield api.app.test_client()
+    api.recipe_context.start()
+
+
+def _ask(client):
+    return client.post("/ask-question", json={"question": QUESTION, "stream": True}, buffered=False)
+
+
+def test_first_delta_arrives_before_generation_finishes(client, provider, sse_events):
+    provider.hold()
+    response = _ask(client)
+    assert response.mimetype == "text/event-stream"
+    events = sse_events(response)
+
+    # The first word reaches the client while the rest of the reply is held back
+    first = next(events)
+    assert first[0] == "delta"
+    assert provider.chunks_generated == 1
+
+    provider.release()
+    rest = list(events)
+    deltas = [first] + [event for event in rest if event[0] == "delta"]
+    assert len(deltas) >= 3
+    assert rest[-1][0] == "answer"
+    assert "".join(data["text"] for _, data in deltas) == rest[-1][1]["answer"]
+
+
+def test_streamed_answer_is_kept_in_the_chat_history(client, sse_events):
+    answer = list(sse_events(_ask(client)))[-1][1]["answer"]
+
+    history = api.recipe_context.chat().get_history()
+    assert history[-2].parts[0].text.endswith(f"User Question: {QUESTION}")
+    assert history[-1].parts[0].text == answer
@@ -1,16 +1,18 @@
 import re
+import json
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 
+import http_client
 from chat.conversation_history import ConversationNode
 from process_recipe.extract_ingredients import extract_ingredients
 from process_recipe.extract_steps import extract_steps
-from process_recipe.step_components.extract_methods import extract_methods
 from process_recipe.recipe import Recipe
-from chat.handle_question import handle_question, reset_conversation_state
+from process_recipe.step_components.lexicons import get_lexicons
+from chat.handle_question import handle_question, stream_question, reset_conversation_state
 
 app = Flask(__name__)
 CORS(app)
@@ -49,7 +51,7 @@ def get_recipe():
 
     # Fetch the page and parse HTML with BeautifulSoup
     try:
-        response = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
+        response = http_client.get(url, headers={"User-Agent": "Mozilla/5.0"})
     except requests.RequestException as e:
         return jsonify({"error": "Failed to fetch URL", "detail": str(e)}), 502
 
@@ -151,9 +153,10 @@ def get_methods():
     if not recipe or not recipe.get_steps():
         return jsonify({"error": "No recipe loaded"}), 404
 
+    # Methods were already extracted for each step when the recipe was loaded
     all_methods = []
     for step in recipe.get_steps():
-        all_methods.extend(extract_methods(step["description"]))
+        all_methods.extend(step["methods"])
     return jsonify({"methods": sorted(set(all_methods))}), 200
 
 
@@ -165,16 +168,44 @@ def ask_question():
     question = data.get("question")
 
 
+    # Stream the answer as Server-Sent Events while the LLM generates it
+    if data.get("stream"):
+        events = _stream_answer_events(question, recipe, recipe_context_text)
+        return Response(
+            stream_with_context(events),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     result = handle_question(question, recipe, recipe_context_text)
-    
-    # Handle both old string format and new dict format for backward compatibility
+    return jsonify(_answer_response(result)), 200
+
+
+# Handle both old string format and new dict format for backward compatibility
+def _answer_response(result) -> dict:
     if isinstance(result, str):
-        return jsonify({"answer": result}), 200
-    else:
-        response = {"answer": result["answer"]}
-        if result.get("suggestions"):
-            response["suggestions"] = result["suggestions"]
-        return jsonify(response), 200
+        return {"answer": result}
+    response = {"answer": result["answer"]}
+    if result.get("suggestions"):
+        response["suggestions"] = result["suggestions"]
+    return response
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# "delta" events carry the answer text as it is generated; the final "answer" event
+# carries the complete response (same body as the non-streaming endpoint)
+def _stream_answer_events(question, recipe, recipe_context_text):
+    try:
+        for kind, value in stream_question(question, recipe, recipe_context_text):
+            if kind == "delta":
+                yield _sse("delta", {"text": value})
+            else:
+                yield _sse("answer", _answer_response(value))
+    except Exception as e:
+        yield _sse("error", {"error": str(e)})
 
 @app.get("/conversation-history")
 def get_history():
@@ -201,5 +232,8 @@ def reset():
 
 
 if __name__ == "__main__":
+    # Load (or build and save) the tool and method lexicons before serving, rather than in
+    # the first request that extracts a recipe
+    get_lexicons()
     app.run(host="0.0.0.0", port=8080, debug=True)
 
@@ -0,0 +1,171 @@
+import threading
+import time
+from typing import Optional
+
+from google.genai import types
+
+from chat.history_policy import HistoryPolicy, history_policy_from_env
+
+
+def _content_text(content) -> str:
+    return "".join(part.text or "" for part in (content.parts or []))
+
+
+# Splits chat history into turns: a user message and everything the model sent back
+def _split_turns(history: list) -> list[list]:
+    turns = []
+    for content in history:
+        if content.role == "user" or not turns:
+            turns.append([])
+        turns[-1].append(content)
+    return turns
+
+
+# Registers the assistant instructions and the recipe with the model once, as cached
+# content, and keeps a chat that references it. Each turn then only sends the user's
+# question (plus whatever changes per turn) instead of resending the instructions and
+# the whole recipe into a history that already holds every earlier copy of them.
+# If the model will not cache the context (e.g. it is below the minimum cache size) it
+# becomes the chat's system instruction instead: still sent with every request, but
+# once per request rather than once per past turn.
+# The chat history is kept to the history policy: older turns are replaced by a summary
+# at the start of the chat, so a long cooking session does not resend every past turn.
+# `client` is an LLM provider (see llm_provider.py): the chat goes through its `chats`
+# and `caches`, single requests through its `send`.
+class RecipeChatContext:
+    def __init__(self, client, model: str, instructions: str, ttl_seconds: int = 3600,
+                 policy: Optional[HistoryPolicy] = None):
+        self.client = client
+        self.model = model
+        self.instructions = instructions
+        self.ttl_seconds = ttl_seconds
+        self.policy = policy or history_policy_from_env()
+        self.recipe_text = None
+        self.cache_name = None
+        self.expires_at = 0.0
+        self.summary = ""
+        self._chat = None
+        self._config = None
+        # Request threads and background prefetches share the chat and its config
+        self._lock = threading.RLock()
+
+    # Starts a new chat about a recipe (None for no recipe), replacing the cached context
+    def start(self, recipe_text: Optional[str] = None):
+        with self._lock:
+            self.release()
+            self.recipe_text = recipe_text
+            self.summary = ""
+            self._chat = self._create_chat()
+            return self._chat
+
+    # The chat to send the next turn to. The cached context is extended when it is close
+    # to expiring, and re-registered (keeping the chat history) if it has already expired.
+    # The history is trimmed to the policy first.
+    def chat(self):
+        with self._lock:
+            if self._chat is None:
+                return self.start(self.recipe_text)
+
+            self._apply_policy()
+
+            if self.cache_name and time.time() > self.expires_at - self.ttl_seconds * 0.1:
+                try:
+                    self.client.caches.update(
+                        name=self.cache_name,
+                        config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+                    )
+                    self.expires_at = time.time() + self.ttl_seconds
+                except Exception as e:
+                    print(f"Recipe context cache expired, registering it again: {e}")
+                    history = self._chat.get_history()
+                    self.cache_name = None
+                    self._chat = self._create_chat(history)
+            return self._chat
+
+    # Folds the oldest turns into the summary while the history is over the policy, and
+    # restarts the chat (same config, no new cache) with the summary and the kept turns
+    def _apply_policy(self):
+        history = self._chat.get_history()
+        if self.summary:
+            # The first turn is the summary itself
+            history = history[2:]
+        turns = _split_turns(history)
+        tokens = [sum(self.policy.estimate_tokens(_content_text(c)) for c in turn) for turn in turns]
+        if not self.policy.over_limit(len(turns), sum(tokens)):
+            return
+
+        while self.policy.over_limit(len(turns), sum(tokens)):
+            turn = turns.pop(0)
+            tokens.pop(0)
+            # Prompts end with the user's own question; that is what is worth keeping
+            question = _content_text(turn[0]).rsplit("User Question:", 1)[-1]
+            self.summary = self.policy.summarize(
+                self.summary,
+                question,
+                " ".join(_content_text(c) for c in turn[1:]),
+            )
+
+        summary_turn = [
+            types.Content(role="user", parts=[types.Part(text=f"Summary of our earlier conversation:\n{self.summary}")]),
+            types.Content(role="model", parts=[types.Part(text="Understood.")]),
+        ]
+        kept = [content for turn in turns for content in turn]
+        self._chat = self.client.chats.create(model=self.model, config=self._config, history=summary_turn + kept)
+
+    # A single request against the same context that is not added to the chat history,
+    # e.g. an answer generated ahead of time that may never be shown. It only reads the
+    # current context: with no chat yet it returns None rather than building one, since
+    # it may run off the request thread.
+    def generate(self, prompt: str) -> Optional[str]:
+        with self._lock:
+            config = self._config if self._chat is not None else None
+        if config is None:
+            return None
+        return self.client.send(self.model, prompt, config=config)
+
+    # Adds a turn that was answered outside the chat (see generate) to its history, so
+    # later turns see it as if it had been sent through the chat
+    def record(self, prompt: str, answer: str):
+        with self._lock:
+            chat = self.chat()
+            history = list(chat.get_history()) + [
+                types.Content(role="user", parts=[types.Part(text=prompt)]),
+                types.Content(role="model", parts=[types.Part(text=answer)]),
+            ]
+            self._chat = self.client.chats.create(model=self.model, config=self._config, history=history)
+
+    # Deletes the cached context on the server (it would otherwise live until its TTL)
+    def release(self):
+        with self._lock:
+            if self.cache_name:
+                try:
+                    self.client.caches.delete(name=self.cache_name)
+                except Exception as e:
+                    print(f"Could not delete the recipe context cache: {e}")
+            self.cache_name = None
+            self.expires_at = 0.0
+            self._chat = None
+
+    def _create_chat(self, history: Optional[list] = None):
+        if self.recipe_text:
+            try:
+                cache = self.client.caches.create(
+                    model=self.model,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=self.instructions,
+                        contents=[types.Content(role="user", parts=[types.Part(text=self.recipe_text)])],
+                        ttl=f"{self.ttl_seconds}s",
+                    ),
+                )
+                self.cache_name = cache.name
+                self.expires_at = time.time() + self.ttl_seconds
+                self._config = types.GenerateContentConfig(cached_content=cache.name)
+                return self.client.chats.create(model=self.model, config=self._config, history=history)
+            except Exception as e:
+                print(f"Could not cache the recipe context, sending it as the system instruction: {e}")
+
+        system_instruction = self.instructions
+        if self.recipe_text:
+            system_instruction = f"{self.instructions}\n{self.recipe_text}"
+        self._config = types.GenerateContentConfig(system_instruction=system_instruction)
+        return self.client.chats.create(model=self.model, config=self._config, history=history)
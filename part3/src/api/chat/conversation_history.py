@@ -1,3 +1,12 @@
+from typing import Optional
+
+from chat.history_policy import HistoryPolicy, history_policy_from_env
+
+
+def _answer_text(answer) -> str:
+    return (answer.get("answer") or "") if isinstance(answer, dict) else str(answer or "")
+
+
 class ConversationNode:
     def __init__(self, question, question_type, answer, step):
         self.question = question
@@ -6,13 +15,21 @@ class ConversationNode:
         self.step = step
         self.next = None
         self.prev = None
+        self.tokens = HistoryPolicy.estimate_tokens(f"{question} {_answer_text(answer)}")
 
 
+# Doubly linked list of the turns of a conversation. Only the turns allowed by the
+# history policy are kept as nodes; older ones are folded into `summary`, so memory per
+# conversation stays bounded however long the session runs.
 class ConversationHistory:
-    def __init__(self):
+    def __init__(self, policy: Optional[HistoryPolicy] = None):
+        self.policy = policy or history_policy_from_env()
         self.head = None
         self.tail = None
         self.current = None
+        self.length = 0
+        self.tokens = 0
+        self.summary = ""
 
     def add_step(self, question, question_type, answer, step_obj):
         node = ConversationNode(question, question_type, answer, step_obj)
@@ -28,6 +45,24 @@ class ConversationHistory:
             self.tail = node
             self.current = node
 
+        self.length += 1
+        self.tokens += node.tokens
+        while self.policy.over_limit(self.length, self.tokens):
+            self._fold_oldest()
+
+    # Drops the oldest turn, keeping a one-line summary of it
+    def _fold_oldest(self):
+        node = self.head
+        self.summary = self.policy.summarize(self.summary, node.question, _answer_text(node.answer), node.question_type)
+
+        self.head = node.next
+        self.head.prev = None
+        node.next = None
+        if self.current is node:
+            self.current = self.head
+        self.length -= 1
+        self.tokens -= node.tokens
+
     def last(self):
         return self.tail
 
@@ -72,6 +107,8 @@ class ConversationHistory:
         cur = self.head
         i = 1
         print("\n=== CONVERSATION HISTORY ===")
+        if self.summary:
+            print(f"Earlier turns:\n{self.summary}\n")
         while cur:
             print(f"{i}. Q: {cur.question}  |  type={cur.question_type}")
             print(f"   A: {cur.answer['answer'] if isinstance(cur.answer, dict) else cur.answer}")
@@ -1,31 +1,82 @@
 import requests
 import re
 import os
-from google import genai
+import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+from google.genai import types
 from dotenv import load_dotenv
 
-from chat.preprocess_question import extract_step_number
+from chat.preprocess_question import extract_step_number, classify_question_with_confidence
 from chat.frame_response.frame_ingredient_substitution import return_ingredient_substitution_response
 
 from process_recipe.recipe import Recipe
 
+from chat.context_cache import RecipeChatContext
+from chat.llm_provider import llm_provider_from_env
 from chat.conversation_history import ConversationHistory
+from chat.semantic_cache import semantic_answer_cache_from_env
 from chat.llm_context import LLM_CONTEXT, QUESTION_CLASSIFICATION_PROMPT
 
 # Load environment variables
 load_dotenv()
 
-# Initialize LLM client
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise ValueError("GEMINI_API_KEY not found. Please set it in your .env file.")
+# LLM provider (LLM_PROVIDER, see llm_provider.py). Gemini's client, and its API key, are
+# only needed once the first request is sent.
+client = llm_provider_from_env()
+# The instructions and the loaded recipe are registered with the model once per recipe;
+# each turn then only sends what changes (see context_cache.py)
+recipe_context = RecipeChatContext(
+    client,
+    "gemini-2.5-flash",
+    f"Instructions:{LLM_CONTEXT}",
+    ttl_seconds=int(os.getenv("CONTEXT_CACHE_TTL", 3600)),
+)
+# Recipe and page text the cached context was built from
+_context_recipe = None
+_context_recipe_text = None
+_context_recipe_hash = None
+
+# Answers that only depend on the recipe (and step) are shared across users and turns
+answer_cache = semantic_answer_cache_from_env()
+CACHEABLE_INTENTS = {
+    "recipe", "all_ingredients", "all_methods", "all_tools",
+    "step_ingredients", "step_methods", "step_tools", "time", "temperature",
+}
 
-client = genai.Client()
-chat = client.chats.create(model="gemini-2.5-flash")
-classification_chat = client.chats.create(model="gemini-2.5-flash-lite")
+# Opt-in speculative prefetch: once a step has been answered, the answer for the step
+# after it is generated in the background (at most SPECULATIVE_PREFETCH_WORKERS at a time)
+# so the following "what's next?" does not wait on the LLM. Prefetched answers are keyed
+# by the recipe context hash and dropped when the recipe changes.
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "0").lower() in ("1", "true", "yes")
+SPECULATIVE_PREFETCH_WORKERS = int(os.getenv("SPECULATIVE_PREFETCH_WORKERS", 1))
+PREFETCH_QUESTION = "What do I do next?"
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=SPECULATIVE_PREFETCH_WORKERS, thread_name_prefix="prefetch")
+_prefetched = {}  # (recipe context hash, step index) -> (prompt, Future of the answer)
+_prefetch_lock = threading.Lock()
+
+# Questions are classified by the local rule-based classifier first; only when its
+# confidence is below this threshold is the question sent to the LLM classifier
+CLASSIFIER_CONFIDENCE_THRESHOLD = float(os.getenv("CLASSIFIER_CONFIDENCE_THRESHOLD", 0.5))
+CLASSIFICATION_MODEL = "gemini-2.5-flash-lite"
+# Classification requests carry only the (truncated) question; the instructions are sent
+# once as a cached system instruction that lives for CLASSIFICATION_CACHE_TTL seconds
+MAX_CLASSIFICATION_QUESTION_CHARS = 300
+CLASSIFICATION_CACHE_TTL = int(os.getenv("CLASSIFICATION_CACHE_TTL", 3600))
+
+_classification_cache_name = None
+_classification_cache_expires_at = 0.0
+_classification_cache_lock = threading.Lock()
 
 conversation = ConversationHistory()
 
+# Per-thread callback that receives LLM output chunks while stream_question is running
+_stream_state = threading.local()
+
 
 global previous_question
 global previous_answer
@@ -35,24 +86,68 @@ previous_question, previous_answer = None, None
 def reset_conversation_state():
     global previous_question
     global previous_answer
-    global chat
-    global classification_chat
+    global _context_recipe
+    global _context_recipe_text
+    global _context_recipe_hash
     previous_question = None
     previous_answer = None
-    chat = client.chats.create(model="gemini-2.5-flash")
-    classification_chat = client.chats.create(model="gemini-2.5-flash")
-
-
-def classify_question_with_llm(question: str) -> str:
-    global classification_chat
-    
+    _context_recipe = None
+    _context_recipe_text = None
+    _context_recipe_hash = None
+    _discard_prefetched()
+    recipe_context.start()
+
+
+# Config for classification requests. The classification instructions are registered
+# once as cached content and referenced by name, so each request only bills the question.
+# If the cache cannot be created (e.g. the prompt is below the model's minimum cache
+# size) they are sent as the system instruction, which still keeps the request size fixed.
+def _classification_config() -> types.GenerateContentConfig:
+    global _classification_cache_name
+    global _classification_cache_expires_at
+
+    with _classification_cache_lock:
+        now = time.time()
+        if now >= _classification_cache_expires_at:
+            try:
+                cache = client.caches.create(
+                    model=CLASSIFICATION_MODEL,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=QUESTION_CLASSIFICATION_PROMPT,
+                        ttl=f"{CLASSIFICATION_CACHE_TTL}s",
+                    ),
+                )
+                _classification_cache_name = cache.name
+                # Renew a little before the server drops it
+                _classification_cache_expires_at = now + CLASSIFICATION_CACHE_TTL * 0.9
+            except Exception as e:
+                print(f"Could not cache the classification prompt: {e}")
+                _classification_cache_name = None
+                # Do not retry on every question
+                _classification_cache_expires_at = now + CLASSIFICATION_CACHE_TTL
+        cache_name = _classification_cache_name
+
+    # A category name is a handful of tokens, and no thinking is needed to pick one
+    options = {
+        "temperature": 0,
+        "max_output_tokens": 16,
+        "thinking_config": types.ThinkingConfig(thinking_budget=0),
+    }
+    if cache_name:
+        return types.GenerateContentConfig(cached_content=cache_name, **options)
+    return types.GenerateContentConfig(system_instruction=QUESTION_CLASSIFICATION_PROMPT, **options)
+
+
+# Classifies with a single stateless LLM request that holds only the current question, so
+# its size stays the same however long the conversation gets.
+# Returns `fallback` if the model cannot be reached.
+def classify_question_with_llm(question: str, fallback: str = "none") -> str:
     # Build the classification prompt
-    prompt = f"{QUESTION_CLASSIFICATION_PROMPT}\n\nUser Question: {question}\n\nCategory:"
+    prompt = f"User Question: {question[:MAX_CLASSIFICATION_QUESTION_CHARS]}\n\nCategory:"
     
     try:
-        # Send message to the classification chat
-        response = classification_chat.send_message(prompt)
-        category = response.text.strip().lower()
+        response = client.send(CLASSIFICATION_MODEL, prompt, config=_classification_config())
+        category = response.strip().lower()
         
         # Validate that the category is one of the expected values
         valid_categories = [
@@ -73,13 +168,22 @@ def classify_question_with_llm(question: str) -> str:
                 if valid_cat in category:
                     return valid_cat
             
-            # If still no match, return "none" as fallback
-            print(f"Warning: LLM returned unexpected category '{category}', defaulting to 'none'")
-            return "none"
+            # If still no match, return the fallback
+            print(f"Warning: LLM returned unexpected category '{category}', defaulting to '{fallback}'")
+            return fallback
             
     except Exception as e:
         print(f"Error classifying question with LLM: {e}")
-        return "none"
+        return fallback
+
+
+# Most turns ("yes", "next", "what are the ingredients") are matched confidently by the
+# local classifier in microseconds, and only ambiguous questions cost an LLM round trip
+def classify_question(question: str) -> str:
+    question_type, confidence = classify_question_with_confidence(question)
+    if confidence >= CLASSIFIER_CONFIDENCE_THRESHOLD:
+        return question_type
+    return classify_question_with_llm(question, fallback=question_type)
 
 
 def _format_recipe_context(recipe: Recipe) -> str:
@@ -213,17 +317,144 @@ def _get_current_step_context(recipe: Recipe) -> str:
     return _format_step_context(recipe.current_step)
 
 
+# The chat for a recipe, whose cached context holds the formatted recipe and the page
+# text. A new chat (and cached context) is started when the recipe changes.
+def _recipe_chat(recipe: Recipe, recipe_context_text: str = None):
+    _update_recipe_context(recipe, recipe_context_text)
+    return recipe_context.chat()
+
+
+# Starts a new chat when the recipe changes. The hash of the recipe context identifies
+# the recipe's content in the answer cache, whichever user loaded it.
+def _update_recipe_context(recipe: Recipe, recipe_context_text: str = None):
+    global _context_recipe
+    global _context_recipe_text
+    global _context_recipe_hash
+
+    if recipe is not _context_recipe or recipe_context_text != _context_recipe_text or _context_recipe_hash is None:
+        context_parts = [f"Recipe:\n{_format_recipe_context(recipe)}"]
+        # Add recipe context text as secondary source of information
+        if recipe_context_text:
+            context_parts.append(f"\n\nAdditional Recipe Context (from original HTML):\n{recipe_context_text}")
+        context = "\n".join(context_parts)
+        _discard_prefetched()
+        recipe_context.start(context)
+        _context_recipe = recipe
+        _context_recipe_text = recipe_context_text
+        _context_recipe_hash = hashlib.sha256(context.encode("utf-8")).hexdigest()
+
+
+# _call_llm for intents whose answer only depends on the recipe and the current step:
+# a question seen before (or one worded almost the same) is answered from the cache
+def _call_llm_cached(question: str, recipe: Recipe, question_type: str, recipe_context_text: str = None) -> str:
+    if question_type not in CACHEABLE_INTENTS:
+        return _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+
+    _update_recipe_context(recipe, recipe_context_text)
+    step_number = None
+    if question_type not in ["recipe", "all_ingredients", "all_methods", "all_tools"]:
+        step_number = getattr(recipe.current_step, "step_number", None)
+    bucket = (_context_recipe_hash, question_type, step_number)
+
+    answer = answer_cache.get(bucket, question)
+    if answer is not None:
+        # The chat still gets the turn, so later questions see what the user was told
+        recipe_context.record(_build_prompt(question, recipe, question_type), answer)
+        # Streaming callers still get the text as a delta
+        on_chunk = getattr(_stream_state, "on_chunk", None)
+        if on_chunk is not None:
+            on_chunk(answer)
+        return answer
+
+    answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+    answer_cache.put(bucket, question, answer)
+    return answer
+
+
+# Starts generating the answer to "what's next?" for the step after `step`, unless it is
+# the last step, it is already being generated, or every prefetch worker is busy
+def _prefetch_step_after(step, recipe: Recipe, recipe_context_text: str = None):
+    if not SPECULATIVE_PREFETCH or step is None:
+        return
+    next_step = recipe.nth_step(step.index + 2)
+    if next_step is None or next_step is step:
+        return
+
+    _update_recipe_context(recipe, recipe_context_text)
+    key = (_context_recipe_hash, next_step.index)
+    prompt = _build_prompt(PREFETCH_QUESTION, recipe, "next_step", specific_step=next_step)
+    with _prefetch_lock:
+        if key in _prefetched:
+            return
+        if sum(not future.done() for _, future in _prefetched.values()) >= SPECULATIVE_PREFETCH_WORKERS:
+            return
+        _prefetched[key] = (prompt, _prefetch_pool.submit(recipe_context.generate, prompt))
+
+
+# The prefetched answer for `step` of the current recipe, waiting for it if it is still
+# being generated. The turn is added to the chat history as if it had been sent through
+# the chat. Prefetches for other steps are dropped, since the user has moved on.
+def _take_prefetched(step, recipe: Recipe, recipe_context_text: str = None) -> Optional[str]:
+    if not SPECULATIVE_PREFETCH or step is None:
+        return None
+
+    _update_recipe_context(recipe, recipe_context_text)
+    with _prefetch_lock:
+        prefetched = _prefetched.pop((_context_recipe_hash, step.index), None)
+    _discard_prefetched()
+    if prefetched is None:
+        return None
+
+    prompt, future = prefetched
+    try:
+        answer = future.result()
+    except Exception as e:
+        print(f"Prefetched answer failed, asking again: {e}")
+        return None
+    if not answer:
+        return None
+
+    recipe_context.record(prompt, answer)
+    on_chunk = getattr(_stream_state, "on_chunk", None)
+    if on_chunk is not None:
+        on_chunk(answer)
+    return answer
+
+
+def _discard_prefetched():
+    with _prefetch_lock:
+        for _, future in _prefetched.values():
+            future.cancel()
+        _prefetched.clear()
+
+
 def _call_llm(question: str, recipe: Recipe, question_type: str = None, additional_context: str = "", recipe_context_text: str = None, specific_step = None) -> str:
-    global chat
-    
-    # Format recipe context
-    recipe_context = _format_recipe_context(recipe)
-    
+    # The instructions and the recipe itself are in the chat's cached context
+    chat = _recipe_chat(recipe, recipe_context_text)
+    prompt = _build_prompt(question, recipe, question_type, additional_context, specific_step)
+
+    # Send message using the chat session
+    on_chunk = getattr(_stream_state, "on_chunk", None)
+    if on_chunk is None:
+        response = chat.send_message(prompt)
+        return response.text
+
+    # Streaming: forward each chunk as it arrives and return the full text as usual
+    parts = []
+    for chunk in chat.send_message_stream(prompt):
+        if chunk.text:
+            parts.append(chunk.text)
+            on_chunk(chunk.text)
+    return "".join(parts)
+
+
+# The per-turn prompt: the question type, the step the question is about and the question
+def _build_prompt(question: str, recipe: Recipe, question_type: str = None, additional_context: str = "", specific_step = None) -> str:
     # Add current step context if available
     current_step_context = _get_current_step_context(recipe)
     
     # Build prompt
-    prompt_parts = [f"Instructions:{LLM_CONTEXT}"]
+    prompt_parts = []
     
     if question_type in ["vague_item", "vague_method", "clarification_specific"] and question_type != "yes":
         prompt_parts.append(f"\nMake sure you tell the user that \"\nLinks for additional information are available in the suggestions section.\"")
@@ -239,26 +470,16 @@ def _call_llm(question: str, recipe: Recipe, question_type: str = None, addition
         elif current_step_context:
             prompt_parts.append(f"\n=== IMPORTANT: ANSWER ONLY ABOUT THE CURRENT STEP BELOW ===\n{current_step_context}\n=== DO NOT COMBINE OR MENTION OTHER STEPS ===\n")
     
-    prompt_parts.append(f"\nRecipe:\n{recipe_context}")
-    
     # Only add current step context if not already added above for step questions
     if current_step_context and question_type not in ["next_step", "previous_step", "current_step", "first_step", "nth_step"]:
-        prompt_parts.append(current_step_context)
-    
-    # Add recipe context text as secondary source of information
-    if recipe_context_text:
-        prompt_parts.append(f"\n\nAdditional Recipe Context (from original HTML):\n{recipe_context_text}")
+        prompt_parts.append(f"\nCurrent Step:\n{current_step_context}")
     
     if additional_context:
         prompt_parts.append(f"\nAdditional Context: {additional_context}")
     
     prompt_parts.append(f"\nUser Question: {question}")
     
-    prompt = "\n".join(prompt_parts)
-    
-    # Send message using the chat session
-    response = chat.send_message(prompt)
-    return response.text
+    return "\n".join(prompt_parts)
 
 # helper functions for ingredient-based questions
 _INGREDIENT_STOPWORDS = {
@@ -360,11 +581,11 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
     conversation.print_history()
 
     
-    question_type = classify_question_with_llm(question)
+    question_type = classify_question(question)
     print("\t", question_type)
 
     if question_type in ["recipe"]:
-        answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+        answer = _call_llm_cached(question, recipe, question_type, recipe_context_text=recipe_context_text)
         previous_answer = {
             "answer": answer,
             "suggestions": {
@@ -401,9 +622,14 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
                     recipe.current_step = temp_step
                 subject_step = recipe.current_step
 
-        # Call LLM to generate response about the step
-        answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text, specific_step=subject_step)
-        
+        # Call LLM to generate response about the step, unless it was prefetched
+        answer = None
+        if question_type == "next_step" and stepped:
+            answer = _take_prefetched(subject_step, recipe, recipe_context_text)
+        if answer is None:
+            answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text, specific_step=subject_step)
+        _prefetch_step_after(subject_step, recipe, recipe_context_text)
+
         # NOTE: If this is true, set previous question, because the bot's response
         #   asks yes/no question at the end
         if subject_step.ingredients:
@@ -435,7 +661,7 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
 
 
     elif question_type in ["step_methods", "all_methods"]:
-        answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+        answer = _call_llm_cached(question, recipe, question_type, recipe_context_text=recipe_context_text)
         
         if question_type == "step_methods":
             previous_answer = {
@@ -459,7 +685,7 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
         return previous_answer
         
     elif question_type in ["all_ingredients", "step_ingredients"]:
-        answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+        answer = _call_llm_cached(question, recipe, question_type, recipe_context_text=recipe_context_text)
         previous_answer = {
             "answer": answer,
             "suggestions": {
@@ -473,7 +699,7 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
     
 
     elif question_type in ["step_tools", "all_tools"]:
-        answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+        answer = _call_llm_cached(question, recipe, question_type, recipe_context_text=recipe_context_text)
         
         if question_type == "step_tools":
             previous_answer = {
@@ -687,7 +913,7 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
         return previous_answer
 
     elif question_type in ["time"]:
-        answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+        answer = _call_llm_cached(question, recipe, question_type, recipe_context_text=recipe_context_text)
         previous_answer = {
             "answer": answer,
             "suggestions": None
@@ -697,7 +923,7 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
 
     
     elif question_type in ["temperature"]:
-        answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+        answer = _call_llm_cached(question, recipe, question_type, recipe_context_text=recipe_context_text)
         previous_answer = {"answer": answer, "suggestions": None}
         conversation.add_step(question, question_type, previous_answer, recipe.current_step)
         return previous_answer 
@@ -711,7 +937,7 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
         search_str_google = f"https://www.google.com/search?q={question_search_term}"
         search_str_youtube = f"https://www.youtube.com/results?search_query={question_search_term}"
         
-        answer = _call_llm(question, recipe, question_type, recipe_context_text=recipe_context_text)
+        answer = _call_llm_cached(question, recipe, question_type, recipe_context_text=recipe_context_text)
 
         previous_answer = {
             "answer": answer,
@@ -798,3 +1024,30 @@ def handle_question(question: str, recipe: Recipe, recipe_context_text: str = No
     else:
         # TODO: Maybe add "did you mean this?" functionality
         return "I'm sorry, I don't know the answer to that question."
+
+
+# Streaming version of handle_question. Yields ("delta", text) for every chunk of LLM
+# output as it arrives, then ("answer", result) with the same result handle_question
+# returns (the final answer may add to or reformat the streamed text).
+# The question is handled on a worker thread so chunks can be yielded while it runs.
+def stream_question(question: str, recipe: Recipe, recipe_context_text: str = None) -> Iterator[tuple[str, object]]:
+    events = queue.Queue()
+
+    def worker():
+        _stream_state.on_chunk = lambda text: events.put(("delta", text))
+        try:
+            events.put(("answer", handle_question(question, recipe, recipe_context_text)))
+        except Exception as e:
+            events.put(("error", e))
+        finally:
+            _stream_state.on_chunk = None
+
+    threading.Thread(target=worker, daemon=True).start()
+
+    while True:
+        kind, value = events.get()
+        if kind == "error":
+            raise value
+        yield kind, value
+        if kind == "answer":
+            return
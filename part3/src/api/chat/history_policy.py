@@ -0,0 +1,55 @@
+import os
+import re
+from typing import Optional
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+# How much of a conversation is kept: the last `max_turns` turns verbatim, and every
+# older turn folded into a short running summary (at most `summary_chars` long, oldest
+# turns are dropped from it first). With `max_tokens`, turns are also folded while the
+# kept turns are estimated to be over that many tokens, always keeping the newest one.
+class HistoryPolicy:
+    def __init__(self, max_turns: int = 20, max_tokens: Optional[int] = None, summary_chars: int = 1500):
+        self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self.summary_chars = summary_chars
+
+    # Rough token count (about 4 characters per token), good enough for a budget
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+
+    # Whether turns have to be folded into the summary, given the number of kept turns
+    # and their estimated tokens
+    def over_limit(self, turns: int, tokens: int) -> bool:
+        if turns <= 1:
+            return False
+        if turns > self.max_turns:
+            return True
+        return self.max_tokens is not None and tokens > self.max_tokens
+
+    # Adds one turn to the running summary as a single short line
+    def summarize(self, summary: str, question: str, answer: str, label: Optional[str] = None) -> str:
+        question = " ".join(_TAG_RE.sub(" ", question or "").split())[:120]
+        answer = " ".join(_TAG_RE.sub(" ", answer or "").split())[:160]
+        line = f"- Q{f' ({label})' if label else ''}: {question} | A: {answer}"
+
+        summary = f"{summary}\n{line}" if summary else line
+        if len(summary) > self.summary_chars:
+            # Keep the most recent lines
+            summary = summary[-self.summary_chars:]
+            summary = summary[summary.find("\n") + 1:] if "\n" in summary else summary
+        return summary
+
+
+# Policy configured from the environment (.env):
+#   HISTORY_MAX_TURNS (default 20), HISTORY_MAX_TOKENS (default 0, no budget),
+#   HISTORY_SUMMARY_CHARS (default 1500)
+def history_policy_from_env() -> HistoryPolicy:
+    max_tokens = int(os.getenv("HISTORY_MAX_TOKENS", 0))
+    return HistoryPolicy(
+        max_turns=int(os.getenv("HISTORY_MAX_TURNS", 20)),
+        max_tokens=max_tokens or None,
+        summary_chars=int(os.getenv("HISTORY_SUMMARY_CHARS", 1500)),
+    )
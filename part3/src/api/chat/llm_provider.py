@@ -0,0 +1,167 @@
+import hashlib
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Iterator, Optional
+
+from google import genai
+from google.genai import types
+
+
+# The LLM the app talks to. A provider implements:
+#  - send/stream/count_tokens for single requests that are not part of a chat (LLM
+#    classification, prefetched answers)
+#  - `chats` and `caches`, shaped like the same parts of genai.Client, for the recipe chat
+#    and its cached context (see context_cache.py): chats.create(model, config, history)
+#    returning a chat with send_message, send_message_stream and get_history, and
+#    caches.create/update/delete. `config` is a genai types.GenerateContentConfig.
+class LLMProvider:
+    name = ""
+
+    def send(self, model: str, prompt: str, config=None) -> str:
+        raise NotImplementedError
+
+    def stream(self, model: str, prompt: str, config=None) -> Iterator[str]:
+        raise NotImplementedError
+
+    def count_tokens(self, model: str, text: str) -> int:
+        raise NotImplementedError
+
+
+# Gemini through genai.Client. The client is only created on first use, so the app can
+# be imported (and run with another provider) without a GEMINI_API_KEY.
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> genai.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    api_key = self.api_key or os.getenv("GEMINI_API_KEY")
+                    if not api_key:
+                        raise ValueError("GEMINI_API_KEY not found. Please set it in your .env file.")
+                    self._client = genai.Client(api_key=api_key)
+        return self._client
+
+    @property
+    def caches(self):
+        return self.client.caches
+
+    @property
+    def chats(self):
+        return self.client.chats
+
+    def send(self, model: str, prompt: str, config=None) -> str:
+        return self.client.models.generate_content(model=model, contents=prompt, config=config).text
+
+    def stream(self, model: str, prompt: str, config=None) -> Iterator[str]:
+        for chunk in self.client.models.generate_content_stream(model=model, contents=prompt, config=config):
+            if chunk.text:
+                yield chunk.text
+
+    def count_tokens(self, model: str, text: str) -> int:
+        return self.client.models.count_tokens(model=model, contents=text).total_tokens
+
+
+class _LocalChat:
+    def __init__(self, provider: "LocalProvider", history: Optional[list] = None):
+        self.provider = provider
+        self._history = list(history or [])
+
+    def send_message(self, message: str):
+        text = self.provider.reply(message)
+        self._record(message, text)
+        return SimpleNamespace(text=text)
+
+    def send_message_stream(self, message: str):
+        text = self.provider.reply(message)
+        self._record(message, text)
+        for chunk in self.provider.chunks(text):
+            yield SimpleNamespace(text=chunk)
+
+    def get_history(self, curated: bool = False) -> list:
+        return list(self._history)
+
+    def _record(self, message: str, text: str):
+        self._history += [
+            types.Content(role="user", parts=[types.Part(text=message)]),
+            types.Content(role="model", parts=[types.Part(text=text)]),
+        ]
+
+
+# A stand-in for the model that needs no network or API key: every request is answered
+# after `latency` seconds with a reply that only depends on the prompt, streamed one word
+# every `chunk_delay` seconds, and cached contexts only get a name. Useful to measure the
+# app's own overhead and to load test it.
+class LocalProvider(LLMProvider):
+    name = "local"
+
+    def __init__(self, latency: float = 0.0, chunk_delay: float = 0.0):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self._cache_count = 0
+        self._lock = threading.Lock()
+        self.caches = SimpleNamespace(create=self._create_cache, update=self._noop, delete=self._noop)
+        self.chats = SimpleNamespace(create=self._create_chat)
+
+    def send(self, model: str, prompt: str, config=None) -> str:
+        return self.reply(prompt)
+
+    def stream(self, model: str, prompt: str, config=None) -> Iterator[str]:
+        return self.chunks(self.reply(prompt))
+
+    # Rough count, about 4 characters per token
+    def count_tokens(self, model: str, text: str) -> int:
+        return len(str(text)) // 4 + 1
+
+    # Same prompt, same reply
+    def reply(self, prompt) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        digest = hashlib.sha256(str(prompt).encode("utf-8")).hexdigest()[:12]
+        return f"Local reply {digest}"
+
+    # The reply as it would be streamed, one word at a time
+    def chunks(self, text: str) -> Iterator[str]:
+        for i, word in enumerate(text.split(" ")):
+            if i == 0:
+                yield word
+                continue
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield f" {word}"
+
+    def _create_cache(self, model: str, config=None):
+        with self._lock:
+            self._cache_count += 1
+            return SimpleNamespace(name=f"cachedContents/local-{self._cache_count}")
+
+    def _noop(self, *args, **kwargs):
+        return None
+
+    def _create_chat(self, model: str, config=None, history: Optional[list] = None):
+        return _LocalChat(self, history)
+
+
+
+# Provider configured from the environment (.env):
+#   LLM_PROVIDER: gemini (default, needs GEMINI_API_KEY) or local (no network, replies
+#   after LOCAL_LLM_LATENCY seconds, default 0, streamed a word every LOCAL_LLM_CHUNK_DELAY
+#   seconds, default 0)
+def llm_provider_from_env() -> LLMProvider:
+    name = os.getenv("LLM_PROVIDER", "gemini").lower()
+    if name == "gemini":
+        return GeminiProvider()
+    if name == "local":
+        return LocalProvider(
+            latency=float(os.getenv("LOCAL_LLM_LATENCY", 0)),
+            chunk_delay=float(os.getenv("LOCAL_LLM_CHUNK_DELAY", 0)),
+        )
+    raise ValueError(f"Unknown LLM_PROVIDER '{name}', expected 'gemini' or 'local'.")
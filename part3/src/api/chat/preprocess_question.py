@@ -1,5 +1,5 @@
 import re
-from chat.question_bank import QUESTION_BANK
+from chat.question_index import QUESTION_INDEX, normalize_question, content_words
 
 # Extract step number from question
 def extract_step_number(question: str) -> int:
@@ -56,86 +56,90 @@ def extract_step_number(question: str) -> int:
     return 1
 
 
-def classify_question(question: str) -> str:
+# Rule-based classification against the question bank, with a confidence in [0, 1]:
+#  - 1.0 for an exact key phrase match
+#  - for a key phrase inside the question (or the question inside a key phrase), how much
+#    of the longer text the shorter covers, with a bonus when the question starts with it
+#  - at most 0.5 for plain word overlap, and 0.0 when nothing matched
+# Cheap enough to run on every turn; the caller decides whether to trust it.
+def classify_question_with_confidence(question: str) -> tuple[str, float]:
     # Normalize question: lowercase, remove punctuation, normalize whitespace
     if "method" in question.lower() or "methods" in question.lower() or "technique" in question.lower():
         if "step" in question.lower():
-            return "step_methods"
+            return "step_methods", 0.9
         else:
-            return "all_methods"
-    question_normalized = question.lower().strip()
-    question_normalized = re.sub(r"[^\w\s]", "", question_normalized)
-    question_normalized = " ".join(question_normalized.split())
+            return "all_methods", 0.9
+    question_normalized = normalize_question(question)
     
     # Get question words (excluding common stop words for better matching)
-    stop_words = {
-        "a", "an", "the", "is", "are",
-        "what", "which", "when", "where", "who", "why",
-        "yes", "no",
-        "do", "does", "did", "should", "could", "would",
-        "use", "used", "using", "need", "needs", "needed",
-    }
-    question_words = set(w for w in question_normalized.split() if w not in stop_words)
+    question_words = content_words(question_normalized)
     
     best_match = None
     best_match_score = 0
+    confidence = 0.0
     exact_match_found = False
     substring_match_found = False
     
-    # Check each question bank for matches
-    for bank in QUESTION_BANK:
-        for key_phrase, category in bank.items():
-            # Normalize key phrase the same way
-            key_normalized = key_phrase.lower().strip()
-            key_normalized = re.sub(r"[^\w\s]", "", key_normalized)
-            key_normalized = " ".join(key_normalized.split())
-            
-            # Get key words (excluding stop words)
-            key_words = set(w for w in key_normalized.split() if w not in stop_words)
+    # Check the key phrases that can match, in question bank order
+    # (the precompiled index skips the ones that cannot affect the result)
+    for index in QUESTION_INDEX.candidates(question_normalized, question_words):
+        key_normalized, key_words, category = QUESTION_INDEX.entries[index]
+        
+        # Step 1: Exact match (highest priority - should win over everything)
+        if key_normalized == question_normalized:
+            exact_match_found = True
+            best_match = category
+            best_match_score = float('inf')  # Highest possible score
+            confidence = 1.0
+            continue
+        
+        # Step 2: Exact substring match (only if no exact match found yet)
+        # Prioritize prefix matches (question starts with key) over general substring matches
+        if not exact_match_found:
+            is_prefix_match = question_normalized.startswith(key_normalized + " ")
+            is_substring_match = key_normalized in question_normalized or question_normalized in key_normalized
             
-            # Step 1: Exact match (highest priority - should win over everything)
-            if key_normalized == question_normalized:
-                exact_match_found = True
-                best_match = category
-                best_match_score = float('inf')  # Highest possible score
-                continue
-            
-            # Step 2: Exact substring match (only if no exact match found yet)
-            # Prioritize prefix matches (question starts with key) over general substring matches
-            if not exact_match_found:
-                is_prefix_match = question_normalized.startswith(key_normalized + " ")
-                is_substring_match = key_normalized in question_normalized or question_normalized in key_normalized
+            if is_prefix_match or is_substring_match:
+                # For single-word questions, prevent matching against long multi-word keys
+                # This prevents "step" from matching "ingredients are used in this step"
+                question_word_count = len(question_words)
+                key_word_count = len(key_words)
+                
+                # Single-word questions should only match single-word or two-word keys
+                if question_word_count == 1 and key_word_count > 2:
+                    continue
                 
-                if is_prefix_match or is_substring_match:
-                    # For single-word questions, prevent matching against long multi-word keys
-                    # This prevents "step" from matching "ingredients are used in this step"
-                    question_word_count = len(question_words)
-                    key_word_count = len(key_words)
-                    
-                    # Single-word questions should only match single-word or two-word keys
-                    if question_word_count == 1 and key_word_count > 2:
-                        continue
-                    
-                    # Prefer prefix matches and longer matches (more specific)
-                    # Prefix matches get a bonus to ensure they win over word overlap
-                    prefix_bonus = 1000 if is_prefix_match else 0
-                    score = prefix_bonus + len(key_normalized)
-                    if score > best_match_score:
-                        substring_match_found = True
-                        best_match = category
-                        best_match_score = score
-                # Step 3: Word overlap (only if no substring match found yet)
-                elif not substring_match_found and key_words and question_words:
-                    # Calculate overlap: how many key words appear in question
-                    overlap = len(key_words & question_words)
-                    # Score based on overlap ratio (prefer matches with more overlap)
-                    overlap_ratio = overlap / len(key_words)
-                    # Also consider the length of the key (prefer longer, more specific keys)
-                    score = overlap_ratio * len(key_normalized)
-                    
-                    # Require at least 50% word overlap to consider it a match
-                    if overlap_ratio >= 0.5 and score > best_match_score:
-                        best_match = category
-                        best_match_score = score
+                # Prefer prefix matches and longer matches (more specific)
+                # Prefix matches get a bonus to ensure they win over word overlap
+                prefix_bonus = 1000 if is_prefix_match else 0
+                score = prefix_bonus + len(key_normalized)
+                if score > best_match_score:
+                    substring_match_found = True
+                    best_match = category
+                    best_match_score = score
+                    shorter, longer = sorted((len(key_normalized), len(question_normalized)))
+                    coverage = shorter / longer if longer else 0.0
+                    confidence = min(0.95, coverage + (0.15 if is_prefix_match else 0.0))
+            # Step 3: Word overlap (only if no substring match found yet)
+            elif not substring_match_found and key_words and question_words:
+                # Calculate overlap: how many key words appear in question
+                overlap = len(key_words & question_words)
+                # Score based on overlap ratio (prefer matches with more overlap)
+                overlap_ratio = overlap / len(key_words)
+                # Also consider the length of the key (prefer longer, more specific keys)
+                score = overlap_ratio * len(key_normalized)
+                
+                # Require at least 50% word overlap to consider it a match
+                if overlap_ratio >= 0.5 and score > best_match_score:
+                    best_match = category
+                    best_match_score = score
+                    # Share of the question's words the key phrase accounts for
+                    confidence = 0.5 * overlap_ratio * overlap / len(question_words)
     
-    return best_match if best_match else "none"
+    if not best_match:
+        return "none", 0.0
+    return best_match, confidence
+
+
+def classify_question(question: str) -> str:
+    return classify_question_with_confidence(question)[0]
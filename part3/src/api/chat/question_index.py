@@ -0,0 +1,94 @@
+import re
+
+from aho_corasick import AhoCorasick
+from chat.question_bank import QUESTION_BANK
+
+
+# Common words ignored when comparing the words of a question and a key phrase
+STOP_WORDS = {
+    "a", "an", "the", "is", "are",
+    "what", "which", "when", "where", "who", "why",
+    "yes", "no",
+    "do", "does", "did", "should", "could", "would",
+    "use", "used", "using", "need", "needs", "needed",
+}
+
+
+# Lowercase, remove punctuation, normalize whitespace
+def normalize_question(text: str) -> str:
+    text = text.lower().strip()
+    text = re.sub(r"[^\w\s]", "", text)
+    return " ".join(text.split())
+
+
+def content_words(normalized: str) -> set[str]:
+    return set(w for w in normalized.split() if w not in STOP_WORDS)
+
+
+# The question bank compiled once into lookup structures, so that finding the key
+# phrases that can possibly match a question costs about the length of the question
+# rather than the size of the bank:
+#  - an automaton over all key phrases (key phrase contained in the question)
+#  - an n-gram index over the key phrases (question contained in a key phrase)
+#  - a word -> key phrase inverted index (word overlap)
+class QuestionBankIndex:
+    def __init__(self, banks: list[dict]):
+        # (normalized key phrase, key words, category), in question bank order
+        self.entries: list[tuple[str, set[str], str]] = []
+        self._by_key: dict[str, list[int]] = {}
+        self._by_word: dict[str, list[int]] = {}
+        self._by_ngram: dict[str, set[int]] = {}
+        # Key phrases that normalize to "" are contained in every question
+        self._always: list[int] = []
+
+        for bank in banks:
+            for key_phrase, category in bank.items():
+                index = len(self.entries)
+                key_normalized = normalize_question(key_phrase)
+                key_words = content_words(key_normalized)
+                self.entries.append((key_normalized, key_words, category))
+
+                if not key_normalized:
+                    self._always.append(index)
+                    continue
+                self._by_key.setdefault(key_normalized, []).append(index)
+                for word in key_words:
+                    self._by_word.setdefault(word, []).append(index)
+                for n in (1, 2, 3):
+                    for i in range(len(key_normalized) - n + 1):
+                        self._by_ngram.setdefault(key_normalized[i:i + n], set()).add(index)
+
+        self._automaton = AhoCorasick(self._by_key)
+
+    # Indices (in bank order) of every entry that could be an exact, substring or
+    # word-overlap match for the question. Entries left out cannot affect the result.
+    def candidates(self, question_normalized: str, question_words: set[str]) -> list[int]:
+        if not question_normalized:
+            # The empty question is a substring of every key phrase
+            return list(range(len(self.entries)))
+
+        found = set(self._always)
+
+        # Key phrase inside the question (covers exact and prefix matches too)
+        for _, _, key in self._automaton.iter_matches(question_normalized):
+            found.update(self._by_key[key])
+
+        # Question inside a key phrase: every such key contains all of the question's n-grams,
+        # so the rarest one bounds the candidates
+        if len(question_normalized) <= 3:
+            found.update(self._by_ngram.get(question_normalized, ()))
+        else:
+            rarest = min(
+                (self._by_ngram.get(question_normalized[i:i + 3], set()) for i in range(len(question_normalized) - 2)),
+                key=len,
+            )
+            found.update(i for i in rarest if question_normalized in self.entries[i][0])
+
+        # Shared words
+        for word in question_words:
+            found.update(self._by_word.get(word, ()))
+
+        return sorted(found)
+
+
+QUESTION_INDEX = QuestionBankIndex(QUESTION_BANK)
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from chat.question_index import normalize_question, content_words
+
+# Words that do not change what is being asked once the intent and step are known
+_FILLER_WORDS = {
+    "i", "me", "my", "we", "us", "our", "you", "your", "it", "its", "this", "that", "these", "those",
+    "can", "will", "please", "tell", "show", "give", "list", "know", "want",
+    "in", "for", "of", "to", "on", "at", "with", "and", "or", "there", "here",
+    "all", "whole", "entire", "recipe", "dish",
+}
+
+
+# Content words of a question, with plurals folded ("tools" and "tool" are the same word)
+def _question_words(normalized: str) -> frozenset[str]:
+    return frozenset(_singular(word) for word in content_words(normalized) - _FILLER_WORDS)
+
+
+def _singular(word: str) -> str:
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+class _CachedAnswer:
+    __slots__ = ("bucket", "words", "answer", "expires_at")
+
+    def __init__(self, bucket: Hashable, words: frozenset[str], answer: str, expires_at: float):
+        self.bucket = bucket
+        self.words = words
+        self.answer = answer
+        self.expires_at = expires_at
+
+
+# Answers of LLM-backed questions, shared by every user. Entries are keyed by
+# (bucket, normalized question), where the bucket is (recipe content hash, intent,
+# step number), so the same question about the same recipe and step is answered once.
+# A question that is not in the bucket verbatim still reuses an answer when it only
+# differs in filler words, e.g. "what are the ingredients?" and "what ingredients do I
+# need". Any other word that differs ("bake the chicken" / "bake the potatoes") makes it a
+# different question, and questions made only of filler words are only matched verbatim.
+# Entries expire after ttl_seconds and the least recently used are evicted past max_entries.
+class SemanticAnswerCache:
+    def __init__(self, max_entries: int = 2000, ttl_seconds: int = 86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, _CachedAnswer] = OrderedDict()
+        # bucket -> content words -> normalized questions with those words
+        self._buckets: dict[Hashable, dict[frozenset[str], set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, bucket: Hashable, question: str) -> Optional[str]:
+        normalized = normalize_question(question)
+        now = time.time()
+        with self._lock:
+            key = (bucket, normalized)
+            entry = self._entries.get(key)
+            if entry is None:
+                key, entry = self._closest(bucket, _question_words(normalized))
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry.answer
+
+    def put(self, bucket: Hashable, question: str, answer: str):
+        normalized = normalize_question(question)
+        entry = _CachedAnswer(bucket, _question_words(normalized), answer, time.time() + self.ttl_seconds)
+        with self._lock:
+            key = (bucket, normalized)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._buckets.setdefault(bucket, {}).setdefault(entry.words, set()).add(normalized)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    # A question in the bucket with the same content words (caller holds the lock)
+    def _closest(self, bucket: Hashable, words: frozenset[str]):
+        if not words:
+            return None, None
+        questions = self._buckets.get(bucket, {}).get(words)
+        if not questions:
+            return None, None
+        key = (bucket, next(iter(questions)))
+        return key, self._entries[key]
+
+    def _remove(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        by_words = self._buckets.get(entry.bucket)
+        if by_words is None:
+            return
+        questions = by_words.get(entry.words)
+        if questions is not None:
+            questions.discard(key[1])
+            if not questions:
+                del by_words[entry.words]
+        if not by_words:
+            del self._buckets[entry.bucket]
+
+
+# Cache configured from the environment (.env):
+#   ANSWER_CACHE_MAX_ENTRIES (default 2000), ANSWER_CACHE_TTL (seconds, default 86400)
+def semantic_answer_cache_from_env() -> SemanticAnswerCache:
+    return SemanticAnswerCache(
+        max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", 2000)),
+        ttl_seconds=int(os.getenv("ANSWER_CACHE_TTL", 86400)),
+    )
@@ -2,6 +2,7 @@ from typing import Optional
 from bs4 import BeautifulSoup, Tag
 import re as _re
 
+from process_recipe.step_components.annotate import annotate_steps
 from process_recipe.step_components.extract_tools import extract_tools
 from process_recipe.step_components.extract_methods import extract_methods
 from process_recipe.step_components.extract_time_temp import extract_time_info, extract_temperature_info
@@ -148,10 +149,12 @@ def extract_steps(recipe: str, ingredients: list[dict]) -> list[dict]:
         return []
     
     context={}
+    # Tokenize and tag every step in one batch; tools and methods share the result
+    annotations = annotate_steps(step_descriptions)
 
     # Loop through each step description
     steps: list[dict] = []
-    for idx, description in enumerate(step_descriptions, start=1):
+    for idx, (description, annotation) in enumerate(zip(step_descriptions, annotations), start=1):
 
         step_ingredients = []
         trimmed_description = _trim_stop_words(description)
@@ -172,8 +175,8 @@ def extract_steps(recipe: str, ingredients: list[dict]) -> list[dict]:
             "step_number": idx,
             "description": description,
             "ingredients": step_ingredients,
-            "tools": extract_tools(description),  # TODO implement this function
-            "methods": extract_methods(description),  # TODO implement this function
+            "tools": extract_tools(description, annotation),
+            "methods": extract_methods(description, annotation),
             "time": extract_time_info(description)
         }
         temp_info, ctx_upd = extract_temperature_info(description, context)
@@ -0,0 +1,37 @@
+from process_recipe.step_components.nlp import sent_tokenize, word_tokenize, pos_tag_sents
+
+
+# A step description split into sentences, tokenized and POS-tagged once,
+# so extract_tools and extract_methods can share the same tagged tokens
+class StepAnnotation:
+    def __init__(self, description: str, tagged_sentences: list[list[tuple[str, str]]]):
+        self.description = description
+        self.tagged_sentences = tagged_sentences
+
+    # All (token, tag) pairs of the step, across sentences
+    @property
+    def tagged(self) -> list[tuple[str, str]]:
+        return [pair for sentence in self.tagged_sentences for pair in sentence]
+
+
+# Annotates all steps of a recipe with a single call to the POS tagger
+def annotate_steps(descriptions: list[str]) -> list[StepAnnotation]:
+    sentence_counts = []
+    token_lists = []
+    for description in descriptions:
+        sentences = sent_tokenize(description) if description else []
+        sentence_counts.append(len(sentences))
+        token_lists.extend(word_tokenize(sentence) for sentence in sentences)
+
+    tagged = pos_tag_sents(token_lists) if token_lists else []
+
+    annotations = []
+    position = 0
+    for description, count in zip(descriptions, sentence_counts):
+        annotations.append(StepAnnotation(description, tagged[position:position + count]))
+        position += count
+    return annotations
+
+
+def annotate_step(description: str) -> StepAnnotation:
+    return annotate_steps([description])[0]
@@ -28,30 +28,54 @@ def _to_float(num: str) -> Optional[float]:
     except Exception:
         return None
 
-RE_RANGE = re.compile(
-    r'(?P<a>\d+)\s*(?:-|to|–|—)\s*(?P<b>\d+)\s*(?P<u>hours?|hrs?|hr|h|minutes?|mins?|min|m|seconds?|secs?|sec|s)\b',
-    re.I
-)
-RE_COMBO = re.compile(
-    r'(?P<h>\d+(?:\s+\d+/\d+|/\d+|[½⅓¼¾⅔⅛⅜⅝⅞])?)\s*(?:hours?|hrs?|hr|h)\s*(?:and|,)?\s*'
-    r'(?P<m>\d+(?:\s+\d+/\d+|/\d+|[½⅓¼¾⅔⅛⅜⅝⅞])?)\s*(?:minutes?|mins?|min|m)\b',
+_NUM = r'\d+(?:\s+\d+/\d+|/\d+|[½⅓¼¾⅔⅛⅜⅝⅞])?'
+_HOURS = r'(?:hours?|hrs?|hr|h)'
+_MINUTES = r'(?:minutes?|mins?|min|m)'
+_SECONDS = r'(?:seconds?|secs?|sec|s)'
+
+# One scanner for every time expression and qualifier. Alternatives are tried in order
+# at each position, so a range or "1 hour 30 minutes" combo is consumed whole before
+# the single-unit patterns can match inside it, and no text is matched twice.
+RE_TIME_TOKEN = re.compile(
+    # Range such as 10-15 minutes
+    r'(?P<range>(?P<ra>\d+)\s*(?:-|to|–|—)\s*(?P<rb>\d+)\s*(?P<ru>hours?|hrs?|hr|h|minutes?|mins?|min|m|seconds?|secs?|sec|s)\b)'
+    # Combo such as 1 hr 30 min
+    rf'|(?P<combo>(?P<ch>{_NUM})\s*{_HOURS}\s*(?:and|,)?\s*(?P<cm>{_NUM})\s*{_MINUTES}\b)'
+    rf'|(?P<hours>(?P<h>{_NUM})\s*{_HOURS}\b)'
+    rf'|(?P<minutes>(?P<m>{_NUM})\s*{_MINUTES}\b)'
+    rf'|(?P<seconds>(?P<s>{_NUM})\s*{_SECONDS}\b)'
+    # Qualifiers: the first three apply to the next time, "per side" to the previous one
+    r'|(?P<approx>\b(?:about|around|approximately|approx\.?)\b)'
+    r'|(?P<at_least>\b(?:at\s+least|minimum(?: of)?)\b)'
+    r'|(?P<at_most>\b(?:at\s+most|no\s+more\s+than|maximum(?: of)?)\b)'
+    r'|(?P<per_side>\bper\s+side\b)',
     re.I
 )
-RE_HOURS = re.compile(r'(?P<h>\d+(?:\s+\d+/\d+|/\d+|[½⅓¼¾⅔⅛⅜⅝⅞])?)\s*(hours?|hrs?|hr|h)\b', re.I)
-RE_MIN   = re.compile(r'(?P<m>\d+(?:\s+\d+/\d+|/\d+|[½⅓¼¾⅔⅛⅜⅝⅞])?)\s*(minutes?|mins?|min|m)\b', re.I)
-RE_SEC   = re.compile(r'(?P<s>\d+(?:\s+\d+/\d+|/\d+|[½⅓¼¾⅔⅛⅜⅝⅞])?)\s*(seconds?|secs?|sec|s)\b', re.I)
-RE_PER_SIDE = re.compile(r'\bper\s+side\b', re.I)
-RE_AT_LEAST = re.compile(r'\b(at\s+least|minimum(?: of)?)\b', re.I)
-RE_AT_MOST  = re.compile(r'\b(at\s+most|no\s+more\s+than|maximum(?: of)?)\b', re.I)
-RE_APPROX   = re.compile(r'\b(about|around|approximately|approx\.?)\b', re.I)
 DONE_CUES   = re.compile(r'\buntil\b[^.]+', re.I)  
 
-def _unit_to_minutes(u: str) -> float:
+def _unit_to_seconds(u: str) -> int:
     u = u.lower()
-    if u.startswith('h'): return 60.0
-    if u.startswith('m'): return 1.0
-    if u.startswith('s'): return 1/60.0
-    return 1.0
+    if u.startswith('h'): return 3600
+    if u.startswith('m'): return 60
+    if u.startswith('s'): return 1
+    return 60
+
+# (min seconds, max seconds) of a time token, kept in seconds so that e.g. 123 sec is not
+# rounded through a fraction of a minute
+def _token_seconds(m: re.Match) -> Tuple[float, float]:
+    kind = m.lastgroup
+    if kind == "range":
+        mult = _unit_to_seconds(m.group('ru'))
+        return int(m.group('ra'))*mult, int(m.group('rb'))*mult
+    if kind == "combo":
+        seconds = (_to_float(m.group('ch')) or 0.0)*3600 + (_to_float(m.group('cm')) or 0.0)*60
+    elif kind == "hours":
+        seconds = (_to_float(m.group('h')) or 0.0)*3600
+    elif kind == "minutes":
+        seconds = (_to_float(m.group('m')) or 0.0)*60
+    else:
+        seconds = _to_float(m.group('s')) or 0.0
+    return seconds, seconds
 
 def extract_time_info(text: str) -> Dict[str, Any]:
     """Return a dict ready to be attached to step['time']"""
@@ -59,74 +83,28 @@ def extract_time_info(text: str) -> Dict[str, Any]:
     tmin: Optional[float] = None
     tmax: Optional[float] = None
 
-    # Range
-    for m in RE_RANGE.finditer(text):
-        a,b,u = int(m.group('a')), int(m.group('b')), m.group('u')
-        mult = _unit_to_minutes(u)
-        mn, mx = a*mult, b*mult
+    # Single left-to-right pass over times and qualifiers
+    pending = {"approx": False, "at_least": False, "at_most": False}
+    for m in RE_TIME_TOKEN.finditer(text):
+        kind = m.lastgroup
+        if kind in pending:
+            pending[kind] = True
+            continue
+        if kind == "per_side":
+            if info["mentions"]:
+                info["mentions"][-1]["per_side"] = True
+            continue
+
+        mn, mx = _token_seconds(m)
         info["mentions"].append({
-            "text": m.group(0), "min_s": int(mn*60), "max_s": int(mx*60),
-            "approx": False, "per_side": bool(RE_PER_SIDE.search(text)),
-            "at_least": False, "at_most": False
+            "text": m.group(0), "min_s": int(mn), "max_s": int(mx),
+            "approx": pending["approx"], "per_side": False,
+            "at_least": pending["at_least"], "at_most": pending["at_most"]
         })
+        pending = {"approx": False, "at_least": False, "at_most": False}
         tmin = mn if tmin is None else min(tmin, mn)
         tmax = mx if tmax is None else max(tmax, mx)
 
-    # Combo such as 1 hr 30 min
-    for m in RE_COMBO.finditer(text):
-        h = _to_float(m.group('h')) or 0.0
-        mn = _to_float(m.group('m')) or 0.0
-        minutes = h*60 + mn
-        info["mentions"].append({
-            "text": m.group(0), "min_s": int(minutes*60), "max_s": int(minutes*60),
-            "approx": False, "per_side": bool(RE_PER_SIDE.search(text)),
-            "at_least": False, "at_most": False
-        })
-        tmin = minutes if tmin is None else min(tmin, minutes)
-        tmax = minutes if tmax is None else max(tmax, minutes)
-
-    # other
-    for m in RE_HOURS.finditer(text):
-        h = _to_float(m.group('h')) or 0.0
-        minutes = h*60
-        approx = bool(RE_APPROX.search(text))
-        at_least = bool(RE_AT_LEAST.search(text))
-        at_most = bool(RE_AT_MOST.search(text))
-        info["mentions"].append({
-            "text": m.group(0), "min_s": int(minutes*60), "max_s": int(minutes*60),
-            "approx": approx, "per_side": bool(RE_PER_SIDE.search(text)),
-            "at_least": at_least, "at_most": at_most
-        })
-        tmin = minutes if tmin is None else min(tmin, minutes)
-        tmax = minutes if tmax is None else max(tmax, minutes)
-
-    for m in RE_MIN.finditer(text):
-        mm = _to_float(m.group('m')) or 0.0
-        approx = bool(RE_APPROX.search(text))
-        at_least = bool(RE_AT_LEAST.search(text))
-        at_most = bool(RE_AT_MOST.search(text))
-        info["mentions"].append({
-            "text": m.group(0), "min_s": int(mm*60), "max_s": int(mm*60),
-            "approx": approx, "per_side": bool(RE_PER_SIDE.search(text)),
-            "at_least": at_least, "at_most": at_most
-        })
-        tmin = mm if tmin is None else min(tmin, mm)
-        tmax = mm if tmax is None else max(tmax, mm)
-
-    for m in RE_SEC.finditer(text):
-        ss = _to_float(m.group('s')) or 0.0
-        approx = bool(RE_APPROX.search(text))
-        at_least = bool(RE_AT_LEAST.search(text))
-        at_most = bool(RE_AT_MOST.search(text))
-        info["mentions"].append({
-            "text": m.group(0), "min_s": int(ss), "max_s": int(ss),
-            "approx": approx, "per_side": bool(RE_PER_SIDE.search(text)),
-            "at_least": at_least, "at_most": at_most
-        })
-        mn = ss/60.0
-        tmin = mn if tmin is None else min(tmin, mn)
-        tmax = mn if tmax is None else max(tmax, mn)
-
     quals = []
     for m in DONE_CUES.finditer(text):
         quals.append(m.group(0).strip())
@@ -135,9 +113,9 @@ def extract_time_info(text: str) -> Dict[str, Any]:
 
     # overall numbers
     if tmin is not None:
-        info["min_seconds"] = int(tmin*60)
+        info["min_seconds"] = int(tmin)
     if tmax is not None:
-        info["max_seconds"] = int(tmax*60)
+        info["max_seconds"] = int(tmax)
 
     def _fmt(sec: int) -> str:
         m, s = divmod(int(sec), 60)
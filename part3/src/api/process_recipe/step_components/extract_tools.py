@@ -1,46 +1,7 @@
-import nltk
-from nltk import pos_tag, word_tokenize, sent_tokenize
-from nltk.corpus import wordnet as wn
-
-nltk.download('punkt', quiet=True)
-nltk.download('averaged_perceptron_tagger', quiet=True)
-nltk.download('wordnet', quiet=True)
-
-def collect_hyponyms(root):
-    items = set()
-    stack = [root]
-    while stack:
-        node = stack.pop()
-        for h in node.hyponyms():
-            items.add(h)
-            stack.append(h)
-    return items
-
-ROOTS = [
-    wn.synset("kitchen_utensil.n.01"),
-    wn.synset("tableware.n.01"),
-    wn.synset("cookware.n.01"),
-    wn.synset("utensil.n.01")
-]
-
-def build_kitchen_tool_list():
-    synsets = set()
-    for root in ROOTS:
-        synsets.update(collect_hyponyms(root))
-
-    # Extract lemma names as English words
-    words = set()
-    for syn in synsets:
-        for lemma in syn.lemmas():
-            # Convert things like "pie-dish" and "frying_pan" to clean tokens
-            words.add(lemma.name().replace("_", " ").lower())
-
-    return sorted(words)
-
-KITCHEN_TOOLS = set(build_kitchen_tool_list())
-KITCHEN_TOOLS.add("oven")  # NOTE: Add additional tools as necessary here
-
+from typing import Optional
 
+from process_recipe.step_components.annotate import StepAnnotation, annotate_step
+from process_recipe.step_components.lexicons import kitchen_tools
 
 
 def extract_noun_phrases(tagged_sent):
@@ -64,18 +25,20 @@ def head_noun(np):
             return tok.lower()
     return None
 
-def extract_tools(description: str) -> list[str]:
+# Pass the step's annotation (see annotate_steps) to reuse its tagged tokens
+def extract_tools(description: str, annotation: Optional[StepAnnotation] = None) -> list[str]:
+    if annotation is None:
+        annotation = annotate_step(description)
+
     tools = set()
-    sentences = sent_tokenize(description)
+    known_tools = kitchen_tools()
 
-    for sentence in sentences:
-        tokens = word_tokenize(sentence)
-        tagged = pos_tag(tokens)
+    for tagged in annotation.tagged_sentences:
         nps = extract_noun_phrases(tagged)
 
         for np in nps:
             hn = head_noun(np)
-            if hn and hn in KITCHEN_TOOLS:
+            if hn and hn in known_tools:
                 tools.add(hn)
 
     return sorted(tools)
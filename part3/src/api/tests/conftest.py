@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Tests never reach Gemini: the app talks to the local provider (see chat/llm_provider.py)
+os.environ["LLM_PROVIDER"] = "local"
+os.environ["SPECULATIVE_PREFETCH"] = "0"
+
+# The API modules import each other from the api directory (e.g. `from chat.x import y`)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chat.handle_question as hq
+from chat.llm_provider import LocalProvider
+from process_recipe.recipe import Recipe
+
+
+# The local provider with a gate on streamed replies: while the gate is held only the first
+# chunk of a reply is generated, so a test can check what reached the client before the
+# rest of the reply exists
+class GatedLocalProvider(LocalProvider):
+    def __init__(self):
+        super().__init__()
+        self.chunks_generated = 0
+        self._open = threading.Event()
+        self._open.set()
+
+    def hold(self):
+        self._open.clear()
+
+    def release(self):
+        self._open.set()
+
+    def chunks(self, text: str):
+        for i, chunk in enumerate(super().chunks(text)):
+            if i and not self._open.wait(timeout=10):
+                raise TimeoutError("streamed reply was held and never released")
+            self.chunks_generated += 1
+            yield chunk
+
+
+# The app's LLM client, replaced by a local provider, with a fresh conversation
+@pytest.fixture
+def provider(monkeypatch):
+    provider = GatedLocalProvider()
+    monkeypatch.setattr(hq, "client", provider)
+    monkeypatch.setattr(hq.recipe_context, "client", provider)
+    monkeypatch.setattr(hq, "conversation", hq.ConversationHistory())
+    hq.reset_conversation_state()
+    yield provider
+    provider.release()
+    hq.reset_conversation_state()
+
+
+# make_recipe(n) builds a recipe with n placeholder steps
+@pytest.fixture
+def make_recipe():
+    def make(step_count: int = 3) -> Recipe:
+        steps = [
+            {"step_number": i + 1, "description": f"Do thing {i + 1}.", "ingredients": [],
+             "tools": [], "methods": [], "time": {}}
+            for i in range(step_count)
+        ]
+        return Recipe("Test recipe", "https://example.com/recipe", [], steps)
+    return make
+
+
+# sse_events(response) yields (event name, data) for each server-sent event of a streamed
+# response, as it arrives
+@pytest.fixture
+def sse_events():
+    def events(response):
+        for chunk in response.iter_encoded():
+            for block in chunk.decode("utf-8").split("\n\n"):
+                if not block.strip():
+                    continue
+                lines = dict(line.split(": ", 1) for line in block.splitlines())
+                yield lines["event"], json.loads(lines["data"])
+    return events
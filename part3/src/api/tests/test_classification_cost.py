@@ -0,0 +1,69 @@
+import pytest
+
+import chat.handle_question as hq
+
+
+QUESTIONS = [
+    "what do I do first?",
+    "ok and then?",
+    "what tools do I need for this step?",
+    "hmm, how long should this take",
+    "can I swap the butter for something else",
+]
+
+
+# Every classification request, measured the way the provider counts tokens
+@pytest.fixture
+def classification_requests(provider, monkeypatch):
+    requests = []
+    send = provider.send
+
+    def record(model, prompt, config=None):
+        if model == hq.CLASSIFICATION_MODEL:
+            requests.append((prompt, provider.count_tokens(model, prompt), config))
+        return send(model, prompt, config=config)
+
+    monkeypatch.setattr(provider, "send", record)
+    # Send every question to the LLM classifier
+    monkeypatch.setattr(hq, "CLASSIFIER_CONFIDENCE_THRESHOLD", 2.0)
+    monkeypatch.setattr(hq, "_classification_cache_expires_at", 0.0)
+    return requests
+
+
+# Classification requests only carry the question, so their cost does not grow with the
+# length of the conversation
+def test_classification_cost_is_constant_over_a_session(classification_requests, make_recipe):
+    recipe = make_recipe(120)
+    for turn in range(100):
+        hq.handle_question(QUESTIONS[turn % len(QUESTIONS)], recipe)
+
+    requests = classification_requests
+    assert len(requests) == 100
+
+    tokens_by_question = {}
+    for contents, tokens, _ in requests:
+        tokens_by_question.setdefault(contents, set()).add(tokens)
+    assert len(tokens_by_question) == len(QUESTIONS)
+    assert all(len(tokens) == 1 for tokens in tokens_by_question.values())
+
+    # The same question costs the same on the first turn and on turn 96
+    assert requests[95][0] == requests[0][0]
+    assert requests[95][1] == requests[0][1]
+
+
+# The instructions are registered once as cached content, not resent with each question
+def test_classification_instructions_are_cached(classification_requests, make_recipe):
+    recipe = make_recipe(120)
+    for turn in range(100):
+        hq.handle_question(QUESTIONS[turn % len(QUESTIONS)], recipe)
+
+    configs = [config for _, _, config in classification_requests]
+    assert all(config.cached_content == configs[0].cached_content for config in configs)
+    assert all(config.cached_content and not config.system_instruction for config in configs)
+
+
+def test_long_questions_are_truncated(classification_requests, provider):
+    hq.classify_question_with_llm("x" * 5000)
+    contents, tokens, _ = classification_requests[-1]
+    assert len(contents) < hq.MAX_CLASSIFICATION_QUESTION_CHARS + 40
+    assert tokens == provider.count_tokens(hq.CLASSIFICATION_MODEL, contents)
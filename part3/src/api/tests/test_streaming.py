@@ -0,0 +1,46 @@
+import pytest
+
+import app as api
+import chat.handle_question as hq
+
+QUESTION = "what do I do first?"
+
+
+@pytest.fixture
+def client(provider, make_recipe, monkeypatch):
+    monkeypatch.setattr(api, "recipe", make_recipe())
+    return api.app.test_client()
+
+
+def _ask(client):
+    return client.post("/ask-question", json={"question": QUESTION, "stream": True}, buffered=False)
+
+
+def test_first_delta_arrives_before_generation_finishes(client, provider, sse_events):
+    provider.hold()
+    response = _ask(client)
+    assert response.mimetype == "text/event-stream"
+    events = sse_events(response)
+
+    # The first word reaches the client while the rest of the reply is held back
+    first = next(events)
+    assert first[0] == "delta"
+    assert provider.chunks_generated == 1
+
+    provider.release()
+    rest = list(events)
+    deltas = [first] + [event for event in rest if event[0] == "delta"]
+    answers = [event for event in rest if event[0] == "answer"]
+    assert len(deltas) >= 3
+    assert len(answers) == 1 and rest[-1] is answers[0]
+    assert "".join(data["text"] for _, data in deltas) == answers[0][1]["answer"]
+
+
+def test_streamed_answer_is_recorded_in_the_conversation(client, sse_events):
+    answer = list(sse_events(_ask(client)))[-1][1]["answer"]
+
+    node = hq.conversation.tail
+    assert hq.conversation.length == 1
+    assert node.question == QUESTION
+    assert node.question_type == "first_step"
+    assert node.answer["answer"] == answer